@@ -0,0 +1,255 @@
+"""
+ASGI entry point for the game's HTTP API.
+
+Serves the same routes and contract as flask_driver.py (/, /init_game,
+/command, /commands, /command_stream and /stats), sharing its sessions and
+command handling, but waits for requests on an event loop. Game commands -
+including the save and load file I/O they do - run on a bounded thread
+pool, so only commands that are actually running hold a thread; a player
+idling between commands costs nothing but their session.
+
+Run it with an ASGI server, e.g. `uvicorn asgi_driver:app`, or directly with
+`python asgi_driver.py`. COMMAND_WORKERS sets the size of the thread pool.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import flask_driver as driver
+
+logger = logging.getLogger(__name__)
+
+# Game commands run here, off the event loop
+executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("COMMAND_WORKERS", 16)),
+    thread_name_prefix='game-command'
+)
+
+# Request bodies are a session ID and one command or a batch of them
+MAX_BODY_SIZE = 1024 * 1024
+
+INDEX_HTML = (Path(__file__).parent / 'templates' / 'index.html').read_bytes()
+
+
+class HTTPError(Exception):
+    """Error answered with a JSON body and status code."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+async def run_blocking(func, *args):
+    """Run a blocking call on the command pool."""
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+
+async def read_json(receive) -> dict:
+    """Read and parse a JSON request body."""
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+        if len(body) > MAX_BODY_SIZE:
+            raise HTTPError(413, "Request body too large")
+    try:
+        data = json.loads(body or b'{}')
+    except ValueError:
+        raise HTTPError(400, "Request body is not valid JSON")
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Request body must be a JSON object")
+    return data
+
+
+async def send_response(send, status: int, body: bytes, content_type: str) -> None:
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', content_type.encode()),
+            (b'content-length', str(len(body)).encode()),
+            (b'cache-control', b'no-cache'),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_json(send, data: dict, status: int = 200) -> None:
+    await send_response(send, status, json.dumps(data).encode(), 'application/json')
+
+
+async def home(scope, receive, send):
+    """Serve the game interface."""
+    await send_response(send, 200, INDEX_HTML, 'text/html; charset=utf-8')
+
+
+async def init_game(scope, receive, send):
+    """Start a game session, or resume the one of the session token sent, if any."""
+    try:
+        data = await read_json(receive)
+        token, output = await run_blocking(driver.start_session, data.get('sessionId'))
+        await send_json(send, {'sessionId': token, 'output': output})
+
+    except HTTPError as e:
+        await send_json(send, {'error': str(e), 'output': str(e)}, e.status)
+    except Exception as e:
+        logger.error(f"Error in init_game: {str(e)}")
+        logger.error(traceback.format_exc())
+        await send_json(send, {
+            'error': str(e),
+            'output': f"Error initializing game: {str(e)}\nPlease contact the administrator."
+        }, 500)
+
+
+async def process_command(scope, receive, send):
+    """Run a game command."""
+    try:
+        data = await read_json(receive)
+        session_id = data.get('sessionId')
+        command = str(data.get('command', '')).strip()
+
+        output = await run_blocking(driver.run_session_command, session_id, command)
+        if output is None:
+            await send_json(send, {'error': 'Session expired', 'output': 'Game session expired or not initialized.'}, 404)
+            return
+        await send_json(send, {'output': output})
+
+    except HTTPError as e:
+        await send_json(send, {'error': str(e), 'output': str(e)}, e.status)
+    except driver.SessionConflict:
+        await send_json(send, {'error': 'Session conflict', 'output': 'Your game was changed by another request at the same time. Please try again.'}, 409)
+    except Exception as e:
+        logger.error(f"Error in process_command: {str(e)}")
+        logger.error(traceback.format_exc())
+        await send_json(send, {
+            'error': str(e),
+            'output': "An error occurred while processing the command. Please try again."
+        }, 500)
+
+
+async def process_commands(scope, receive, send):
+    """Run a batch of game commands in order."""
+    try:
+        data = await read_json(receive)
+        session_id = data.get('sessionId')
+        try:
+            commands = driver.parse_command_batch(data)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+        start = time.perf_counter()
+        results = await run_blocking(driver.run_session_commands, session_id, commands)
+        if results is None:
+            await send_json(send, {'error': 'Session expired', 'output': 'Game session expired or not initialized.'}, 404)
+            return
+        await send_json(send, {
+            'results': results,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 3)
+        })
+
+    except HTTPError as e:
+        await send_json(send, {'error': str(e), 'output': str(e)}, e.status)
+    except driver.SessionConflict:
+        await send_json(send, {'error': 'Session conflict', 'output': 'Your game was changed by another request at the same time. Please try again.'}, 409)
+    except Exception as e:
+        logger.error(f"Error in process_commands: {str(e)}")
+        logger.error(traceback.format_exc())
+        await send_json(send, {
+            'error': str(e),
+            'output': "An error occurred while processing the commands. Please try again."
+        }, 500)
+
+
+async def process_command_stream(scope, receive, send):
+    """Run a game command, streaming its output as Server-Sent Events."""
+    try:
+        data = await read_json(receive)
+    except HTTPError as e:
+        await send_json(send, {'error': str(e), 'output': str(e)}, e.status)
+        return
+    session_id = data.get('sessionId')
+    command = str(data.get('command', '')).strip()
+
+    # (event, data) pairs from the command thread; None once it is finished
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    def emit(item):
+        loop.call_soon_threadsafe(events.put_nowait, item)
+    def run():
+        try:
+            driver.emit_command_events(session_id, command, emit)
+        finally:
+            emit(None)
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+    done = loop.run_in_executor(executor, run)
+    while True:
+        item = await events.get()
+        if item is None:
+            break
+        await send({'type': 'http.response.body', 'body': driver.format_event(*item).encode(), 'more_body': True})
+    await send({'type': 'http.response.body', 'body': b''})
+    await done
+
+
+async def stats(scope, receive, send):
+    """Report session counters."""
+    await send_json(send, driver.sessions.stats())
+
+
+ROUTES = {
+    ('GET', '/'): home,
+    ('POST', '/init_game'): init_game,
+    ('POST', '/command'): process_command,
+    ('POST', '/commands'): process_commands,
+    ('POST', '/command_stream'): process_command_stream,
+    ('GET', '/stats'): stats,
+}
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            executor.shutdown(wait=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI application."""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    route = ROUTES.get((scope['method'], scope['path']))
+    if route is None:
+        status = 405 if any(path == scope['path'] for _, path in ROUTES) else 404
+        await send_json(send, {'error': 'Method not allowed' if status == 405 else 'Not found'}, status)
+        return
+    await route(scope, receive, send)
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=int(os.getenv("PORT", 8080)))
@@ -0,0 +1,64 @@
+"""
+Compile each world's JSON data into a single bundle file.
+
+Run this as a build step so game servers can load every world with one
+file read instead of walking the data directory:
+
+    python compile_worlds.py [world_id ...]
+
+Bundles are only used while they are newer than their JSON sources; if a
+data file is edited afterwards the game falls back to the JSON files until
+this script is run again.
+"""
+
+import sys
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Tuple
+
+# Add src directory to path
+current_dir = Path(__file__).parent
+src_dir = current_dir / 'src'
+sys.path.append(str(src_dir))
+from core.world.GameWorld import GameWorld
+from core.loaders.WorldBundle import WorldBundle
+from core.loaders.WorldLoadReport import WorldLoadReport
+
+logger = logging.getLogger(__name__)
+
+def compile_world(world_id: str) -> Tuple[Path, WorldLoadReport]:
+    """Load a world from its JSON files and write its bundle."""
+    world = GameWorld(world_id)
+    world.load_from_source()
+
+    bundle_path = WorldBundle.get_bundle_path(GameWorld._get_world_path(world_id))
+    WorldBundle.write(bundle_path, WorldBundle.compile(world))
+    return bundle_path, world.load_report
+
+def main(world_ids):
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+
+    if not world_ids:
+        with open(GameWorld._get_config_path()) as f:
+            world_ids = list(json.load(f))
+
+    failed = False
+    for world_id in world_ids:
+        start = time.perf_counter()
+        try:
+            bundle_path, report = compile_world(world_id)
+        except Exception as e:
+            logger.error(f"Failed to compile world '{world_id}': {str(e)}")
+            failed = True
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Compiled {world_id} -> {bundle_path.relative_to(current_dir)} ({elapsed:.1f} ms)")
+        if not report.is_clean:
+            print(f"  unresolved references: {report.summary()}")
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,19 +1,25 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
 import sys
 import os
-import queue
+import json
 import logging
+import queue
+import threading
 import traceback
 from pathlib import Path
-import pickle
-import hashlib
-import datetime
+import time
 
 # Add src directory to path
 current_dir = Path(__file__).parent
 src_dir = current_dir / 'src'
 sys.path.append(str(src_dir))
 from core.Game import Game
+from core.world.GameWorld import GameWorld
+from core.world.ContentReloader import ContentReloader
+from core.systems.SessionManager import SessionManager
+from core.systems.SessionSnapshot import SessionSnapshot
+from core.systems.SessionStore import create_session_store
+from core.systems.SessionTokens import SessionTokens
 
 # Initialize Flask app
 app = Flask(__name__, template_folder=str(current_dir / 'templates'))
@@ -27,174 +33,161 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Game state management
-games = {}  # Store instantiated games
-output_queues = {}  # Store output queues for each game
-
-def get_client_id():
-    """Generate unique client ID from IP and user agent"""
-    client_str = f"{request.remote_addr}_{request.user_agent.string}"
-    return hashlib.sha256(client_str.encode()).hexdigest()[:16]
-
-def capture_output(output_queue):
-    """Capture stdout for game output"""
-    from io import StringIO
-    old_stdout = sys.stdout
-    string_io = StringIO()
-    sys.stdout = string_io
+# Build the shared world templates once so new sessions only copy them;
+# set PARALLEL_WORLD_LOADING=1 to build the worlds concurrently
+GameWorld.use_bundles = os.getenv("HOT_RELOAD", "0") != "1"
+Game.parallel_world_loading = os.getenv("PARALLEL_WORLD_LOADING", "0") == "1"
+Game.preload_worlds()
 
-    def flush_output():
-        output = string_io.getvalue()
-        if output:
-            output_queue.put(output)
-            string_io.truncate(0)
-            string_io.seek(0)
+# Set HOT_RELOAD=1 while editing world data to apply changes to running
+# sessions; worlds are then loaded from their JSON files, not bundles
+content_reloader = None
+if os.getenv("HOT_RELOAD", "0") == "1":
+    content_reloader = ContentReloader()
+    content_reloader.start()
 
-    def restore_stdout():
-        sys.stdout = old_stdout
-
-    return flush_output, restore_stdout
-
-# In flask_driver.py
-
-def save_game_state(session_id, save_name=None):
-    """Save game state to file"""
+# Game state management
+# A snapshot of every session is stored after each command. SESSION_STORE
+# picks the backend: "memory" (default) keeps them in this process, while
+# "sqlite:///path/to/sessions.db" shares them so any worker process can
+# serve any player. Sessions idle for SESSION_IDLE_TTL seconds, or the
+# least recently used beyond MAX_SESSIONS, are dropped from memory and
+# restored from their snapshot on their next request.
+session_store = create_session_store(os.getenv("SESSION_STORE", "memory"))
+
+class SessionConflict(Exception):
+    """Another worker saved a session while this one was running a command for it."""
+
+def store_session(session):
+    """Save a session's snapshot; the caller must hold session.lock.
+
+    Raises SessionConflict if another worker has saved the session since this
+    one loaded it; the session is then reloaded and this worker's changes dropped.
+    """
     try:
-        if session_id in games:
-            game = games[session_id]
-            saves_dir = Path('saves')
-            saves_dir.mkdir(exist_ok=True)
-
-            # Get current room and world info
-            current_room = None
-            current_world = None
-            if game.player.current_room:
-                # Find the room's ID by searching through current world's rooms
-                for room_id, room in game.current_world.rooms.items():
-                    if room == game.player.current_room:
-                        current_room = room_id
-                        break
-                current_world = game.current_world.name
-
-            # Build state object
-            state = {
-                'metadata': {
-                    'save_name': save_name or session_id,
-                    'timestamp': datetime.datetime.now().strftime("%Y%m%d_%H%M%S"),
-                    'version': '1.0'
-                },
-                'game_state': {
-                    'world_progress': game.game_state.progression.world_progress,
-                    'current_world': current_world,
-                    'current_room': current_room
-                },
-                'player_state': {
-                    'inventory': [item.name for item in game.player.inventory],
-                    'visited_rooms': list(game.player.state.visited_rooms),
-                    'current_room_id': current_room,
-                    'current_world_id': current_world,
-                    'discovered_commands': list(game.player.state.discovered_commands),
-                    'attributes': game.player.state.attributes
-                },
-                'world_state': {
-                    'rooms': {
-                        room_id: {
-                            'items': [item.name for item in room.items],
-                            'npcs': [npc.name for npc in getattr(room, 'npcs', [])]
-                        }
-                        for room_id, room in game.current_world.rooms.items()
-                    }
-                }
-            }
-
-            # Generate filename and save
-            timestamp = state['metadata']['timestamp']
-            filename = f"{save_name or session_id}_{timestamp}.save"
-            with open(saves_dir / filename, 'wb') as f:
-                pickle.dump(state, f)
-
-            return True
-
+        version = session_store.save(session.session_id, SessionSnapshot.capture(session.game), session.version)
     except Exception as e:
-        logger.error(f"Error saving game state: {str(e)}")
+        logger.error(f"Error storing session {session.session_id}: {str(e)}")
         logger.error(traceback.format_exc())
-        return False
+        return
+    if version is None:
+        logger.warning(f"Session {session.session_id} was saved by another worker; dropping this command's changes")
+        reload_session(session)
+        raise SessionConflict("Session was changed by another request")
+    session.version = version
+
+def reload_session(session):
+    """Replace a session's game with its stored snapshot; the caller must hold session.lock."""
+    stored = session_store.load(session.session_id)
+    if stored is not None:
+        session.version, snapshot = stored
+        session.game = restore_game(snapshot, session.session_id)
+
+def is_session_stored(session):
+    """Check whether an evicted session can be restored from the store."""
+    return session.version is not None
+
+def restore_game(snapshot, owner):
+    """Rebuild a game from a session snapshot onto the shared world templates."""
+    game = Game()
+    game.game_state.owner = owner
+    game.display.capture()
+    SessionSnapshot.apply(game, snapshot)
+    return game
+
+def restore_session(session_id):
+    """Rebuild a session this worker does not hold from the session store."""
+    stored = session_store.load(session_id)
+    if stored is None:
+        return None
+    version, snapshot = stored
+    return restore_game(snapshot, session_id), version
+
+sessions = SessionManager(  # Live games; each one buffers its own output
+    idle_ttl=float(os.getenv("SESSION_IDLE_TTL", 30 * 60)),
+    max_sessions=int(os.getenv("MAX_SESSIONS", 500)),
+    on_evict=is_session_stored,
+    on_restore=restore_session,
+)
 
-def load_game_state(session_id, save_name):
-    """Load game state from file and initialize a new Game instance."""
-    try:
-        saves_dir = Path('saves')
-        
-        # Find specified save file
-        pattern = f"{save_name}_*.save"
-        save_files = list(saves_dir.glob(pattern))
-        if not save_files:
-            return None
+# Players get a random, signed session token from /init_game and send it back
+# with every command, and to /init_game again to pick their game back up.
+# Tokens are signed with SESSION_SECRET, or else with a key generated once
+# and kept in saves/session_secret, so they stay valid across restarts and
+# stored sessions and saves are not orphaned. Separate server processes
+# (not forked workers) serving the same players need the same key.
+session_secret = os.getenv("SESSION_SECRET", "")
+if session_secret:
+    session_tokens = SessionTokens(session_secret.encode())
+else:
+    session_tokens = SessionTokens.with_secret_file(Path("saves") / "session_secret")
 
-        save_path = max(save_files, key=lambda p: p.stat().st_mtime)
-
-        with open(save_path, 'rb') as f:
-            state = pickle.load(f)
-
-        # Create and setup new game
-        game = Game()
-        game.setup()  # Initialize the game first
-
-        # Load game state
-        if 'game_state' in state:
-            game.game_state.progression.world_progress = state['game_state']['world_progress']
-            
-            # Set current world
-            world_name = state['game_state']['current_world']
-            if world_name in game.worlds:
-                game.current_world = game.worlds[world_name]
-                game.current_world.initialize(game.game_state)
-
-        # Load player state
-        if 'player_state' in state:
-            # Load inventory
-            game.player.inventory.clear()
-            for item_name in state['player_state']['inventory']:
-                # Find matching item in current world's items
-                for world_item in game.current_world.items.values():
-                    if world_item.name == item_name:
-                        game.player.inventory.add(world_item)
-                        break
-
-            # Load other player state
-            game.player.state.visited_rooms = set(state['player_state']['visited_rooms'])
-            game.player.state.discovered_commands = set(state['player_state']['discovered_commands'])
-            game.player.state.attributes = state['player_state']['attributes']
-            
-            # Set current room
-            current_room_id = state['player_state']['current_room_id']
-            if current_room_id and current_room_id in game.current_world.rooms:
-                game.player.current_room = game.current_world.rooms[current_room_id]
-                game.player.state.current_room_id = current_room_id
-                game.player.state.current_world_id = state['player_state']['current_world_id']
-
-        # Load world state (room contents)
-        if 'world_state' in state and 'rooms' in state['world_state']:
-            for room_id, room_data in state['world_state']['rooms'].items():
-                if room_id in game.current_world.rooms:
-                    room = game.current_world.rooms[room_id]
-                    
-                    # Restore items
-                    room.items.clear()
-                    for item_name in room_data['items']:
-                        for world_item in game.current_world.items.values():
-                            if world_item.name == item_name:
-                                room.items.add(world_item)
-                                break
-
-        games[session_id] = game
-        return game
+# In flask_driver.py
 
-    except Exception as e:
-        logger.error(f"Error loading game state: {str(e)}")
-        logger.error(traceback.format_exc())
+def save_game_state(session, save_name=None):
+    """Save a session's game under save_name, or under the session ID"""
+    if session is None:
+        return False
+    return session.game.game_state.save_game(save_name or session.session_id)
+
+def load_game_state(save_name, owner):
+    """Load one of owner's saves into a new Game instance."""
+    game = Game()
+    game.game_state.owner = owner
+    game.display.capture()
+    if not game.game_state.load_game(save_name):
         return None
-    
+    return game
+
+def create_game(owner=None):
+    """Create and set up a new game that writes to its own output buffer.
+
+    The game's saves belong to owner.
+    """
+    game = Game()
+    game.game_state.owner = owner
+    game.display.capture()
+    game.setup()  # Initialize the world, player's start location, etc
+    game.display.take_output()
+    return game
+
+def resume_game(session):
+    """Show a returning player where they are in their game."""
+    game = session.game
+    game.display.write("Welcome back! Continuing your game.")
+    game.command_processor.look()
+    return game.display.take_output()
+
+def start_session(token=None):
+    """Start or resume a session; returns the session token and opening output.
+
+    A genuine token from an earlier visit keeps its session ID, so the player
+    keeps their saves: their game carries on, or starts afresh under the same
+    ID if it is no longer stored. Any other token gets a new session.
+    """
+    session_id = session_tokens.validate(token)
+    if session_id is None:
+        token = session_tokens.issue()
+        session_id = session_tokens.validate(token)
+
+    while True:
+        output = with_session(token, resume_game)
+        if output is not None:
+            return token, output
+
+        session = sessions.create(session_id, lambda: create_game(session_id))
+        with session.lock:
+            game = session.game
+            game.intro()
+            game.command_processor.look() # Now safe to call after setup()
+            output = game.display.take_output()
+            try:
+                store_session(session)
+            except SessionConflict:
+                # Another worker started this session first; carry on with its game
+                continue
+        return token, output
+
 @app.route('/')
 def home():
     """Render the game interface"""
@@ -202,33 +195,13 @@ def home():
 
 @app.route('/init_game', methods=['POST'])
 def init_game():
-    """Initialize a new game session."""
+    """Start a game session, or resume the one of the session token sent, if any."""
     try:
-        client_id = get_client_id()
-        session_id = f"session_{client_id}"
-        output_queue = queue.Queue()
-
-        # Always create a new game instance
-        game = Game()
-        games[session_id] = game
-        game.setup()  # Initialize the world, player's start location, etc
-
-        output_queues[session_id] = output_queue
-        flush_output, restore_stdout = capture_output(output_queue)
-
-        try:
-            game.intro()
-            game.command_processor.look() # Now safe to call after setup()
-            flush_output()
-        finally:
-            restore_stdout()
-
-        output = ""
-        while not output_queue.empty():
-            output += output_queue.get()
+        data = request.get_json(silent=True) or {}
+        token, output = start_session(data.get('sessionId'))
 
         return jsonify({
-            'sessionId': session_id,
+            'sessionId': token,
             'output': output
         })
 
@@ -240,82 +213,270 @@ def init_game():
             'output': f"Error initializing game: {str(e)}\nPlease contact the administrator."
         }), 500
     
-@app.route('/command', methods=['POST'])
-def process_command():
-    """Process game commands."""
+def run_command(session, command):
+    """Run one player command against a session and return the game's output.
+
+    The caller must hold session.lock.
+    """
+    session.game.display.capture()
+    execute_command(session, command)
+    # A loaded game replaces the session's game and writes to its own buffer
+    return session.game.display.take_output()
+
+def stream_command(session, command, on_write):
+    """Run one player command, passing each piece of output to on_write(text) as it is written.
+
+    The caller must hold session.lock.
+    """
+    session.game.display.stream(on_write)
     try:
-        data = request.get_json()
+        execute_command(session, command)
+    finally:
+        session.game.display.capture()
+
+def execute_command(session, command):
+    """Run one player command, writing everything it says to the game's display."""
+    game = session.game
+    display = game.display
+
+    # Check if the command is to load a game
+    if game.command_processor.awaiting_boss_choice:
+        game.command_processor.process_command(command)
+    elif command.lower().split()[:2] == ["load", "game"]:
+        game.command_processor.handle_load_game(command.split()[2:])
+        # game.command_processor.look() # Removed, because we don't want to look immediately after typing load game
+    elif game.command_processor.awaiting_load_choice:
+        try:
+            choice = int(command)
+            save = game.game_state.get_save(choice)
+            if save:
+                save_name = save['name']
+                loaded_game = load_game_state(save_name, game.game_state.owner)
+                if loaded_game:
+                    # The loaded game replaces this session's game and
+                    # carries on writing where this one was writing
+                    session.game = loaded_game
+                    loaded_game.display.take_output()
+                    loaded_game.display.output = display.output
+                    display.write(f'Loaded save game "{save_name}".')
+                    loaded_game.command_processor.look()
+                else:
+                    display.write("Failed to load save game.")
+            else:
+                display.write("Invalid save number.")
+        except ValueError:
+            display.write("Please enter a valid number.")
+        finally:
+            game.command_processor.awaiting_load_choice = False
+    
+    elif game.command_processor.awaiting_save_name:
+        # Handle save name input
+        success = save_game_state(session, command)
+        if success:
+            display.write(f'Game saved as "{command}".')
+        else:
+            display.write("Failed to save game.")
+        game.command_processor.awaiting_save_name = False  # Clear the flag
+    else:
+        # Process other commands using the command processor
+        game.command_processor.process_command(command)
+
+    # Holding all three fragments starts the boss battle
+    session.game.boss_battle.trigger_battle()
+
+def run_session_command(token, command):
+    """Run a command for a session token, restoring the session if it was evicted.
+
+    Returns None if there is no such session.
+    """
+    return with_session(token, lambda session: run_command(session, command))
+
+def run_session_commands(token, commands):
+    """Run a list of commands in order for a session token without releasing it in between.
+
+    Returns each command's output and run time, or None if there is no such session.
+    A command that fails gets an error entry and ends the batch; the commands
+    before it have already changed the game, so their results are still returned.
+    """
+    def run_all(session):
+        results = []
+        for command in commands:
+            start = time.perf_counter()
+            try:
+                result = {'command': command, 'output': run_command(session, command)}
+            except Exception as e:
+                logger.error(f"Error running batched command {command!r}: {str(e)}")
+                logger.error(traceback.format_exc())
+                result = {
+                    'command': command,
+                    'error': str(e),
+                    'output': session.game.display.take_output() +
+                              "An error occurred while processing the command. Please try again."
+                }
+            result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+            results.append(result)
+            if 'error' in result:
+                break
+        return results
+    return with_session(token, run_all)
+
+def stream_session_command(token, command, on_write):
+    """Run a command for a session token, streaming its output to on_write(text).
+
+    Returns False if there is no such session.
+    """
+    def run(session):
+        stream_command(session, command, on_write)
+        return True
+    return with_session(token, run) is not None
+
+def emit_command_events(token, command, emit):
+    """Run a command for a session token, reporting it as emit((event, data)) calls.
+
+    Emits an "output" event with each piece of text as it is written, then
+    "done", or "error" with an error and output message if the command
+    could not run.
+    """
+    try:
+        if stream_session_command(token, command, lambda text: emit(('output', text))):
+            emit(('done', {}))
+        else:
+            emit(('error', {'error': 'Session expired', 'output': 'Game session expired or not initialized.'}))
+    except SessionConflict:
+        emit(('error', {'error': 'Session conflict', 'output': 'Your game was changed by another request at the same time. Please try again.'}))
+    except Exception as e:
+        logger.error(f"Error streaming command: {str(e)}")
+        logger.error(traceback.format_exc())
+        emit(('error', {
+            'error': str(e),
+            'output': "An error occurred while processing the command. Please try again."
+        }))
+
+def format_event(event, data):
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def with_session(token, work):
+    """Call work(session) holding the session's lock and store the session afterwards.
+
+    The session is restored if this worker does not hold it, and refreshed if
+    another worker has played it since. Returns None if the token is not
+    genuine or there is no such session, and raises SessionConflict if
+    another worker played it while work was running.
+    """
+    session_id = session_tokens.validate(token)
+    while session_id:
+        session = sessions.get_or_restore(session_id)
+        if session is None:
+            return None
+
+        # One command at a time per session; other sessions run in parallel
+        with session.lock:
+            if session.closed:
+                # Evicted while we waited for it; look it up again
+                continue
+            session.touch()
+
+            # Another worker may have played this session since we last did
+            if session_store.shared and session_store.version(session_id) != session.version:
+                reload_session(session)
+
+            session.game.apply_content_updates()
+            result = work(session)
+            store_session(session)
+            return result
+    return None
+
+@app.route('/stats')
+def stats():
+    """Report session counters."""
+    return jsonify(sessions.stats())
+
+# Longest command list accepted by /commands
+MAX_BATCH_COMMANDS = 1000
+
+def parse_command_batch(data):
+    """Get the list of commands from a /commands request, or raise ValueError."""
+    commands = data.get('commands')
+    if not isinstance(commands, list) or not all(isinstance(command, str) for command in commands):
+        raise ValueError("'commands' must be a list of strings")
+    if len(commands) > MAX_BATCH_COMMANDS:
+        raise ValueError(f"At most {MAX_BATCH_COMMANDS} commands can be sent at once")
+    return [command.strip() for command in commands]
+
+@app.route('/commands', methods=['POST'])
+def process_commands():
+    """Process a batch of game commands in order."""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            message = "Request body must be a JSON object"
+            return jsonify({'error': message, 'output': message}), 400
         session_id = data.get('sessionId')
-        command = data.get('command', '').strip()
+        try:
+            commands = parse_command_batch(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
-        if not session_id or session_id not in games:
+        start = time.perf_counter()
+        results = run_session_commands(session_id, commands)
+        if results is None:
             return jsonify({'error': 'Session expired', 'output': 'Game session expired or not initialized.'}), 404
 
-        game = games[session_id]  # Retrieve the game instance
-        output_queue = output_queues[session_id]
-        flush_output, restore_stdout = capture_output(output_queue)
+        return jsonify({
+            'results': results,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 3)
+        })
+
+    except SessionConflict:
+        return jsonify({'error': 'Session conflict', 'output': 'Your game was changed by another request at the same time. Please try again.'}), 409
+    except Exception as e:
+        logger.error(f"Error in process_commands: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'output': "An error occurred while processing the commands. Please try again."
+        }), 500
 
-        output = ""
+@app.route('/command_stream', methods=['POST'])
+def process_command_stream():
+    """Process a game command, streaming its output as Server-Sent Events (see emit_command_events)."""
+    data = request.get_json(silent=True) or {}
+    session_id = data.get('sessionId')
+    command = str(data.get('command', '')).strip()
 
+    # (event, data) pairs from the command thread; None once it is finished
+    events = queue.Queue()
+    def run():
         try:
-            # Check if the command is to load a game
-            if command.lower() == "load game":
-                game.command_processor.handle_load_game()
-                # game.command_processor.look() # Removed, because we don't want to look immediately after typing load game
-            elif game.command_processor.awaiting_load_choice:
-                try:
-                    choice = int(command)
-                    saves = game.game_state.list_saves()
-                    if 1 <= choice <= len(saves):
-                        save_name = saves[choice - 1]['name']
-                        game = load_game_state(session_id, save_name)
-                        if game:
-                            # If a game was loaded, set the game and output_queue in the globals
-                            games[session_id] = game
-                            output_queues[session_id] = queue.Queue()
-
-                            flush_output, restore_stdout = capture_output(output_queues[session_id])
-                            try:
-                                game.command_processor.look()
-                                flush_output()
-                            finally:
-                                restore_stdout()
-
-                            output = f'Loaded save game "{save_name}".\n'
-                            while not output_queues[session_id].empty():
-                                output += output_queues[session_id].get()
-                        else:
-                            output = "Failed to load save game.\n"
-                    else:
-                        output = "Invalid save number.\n"
-                except ValueError:
-                    output = "Please enter a valid number.\n"
-                finally:
-                    game.command_processor.awaiting_load_choice = False
-            
-            elif game.command_processor.awaiting_save_name:
-                # Handle save name input
-                success = save_game_state(session_id, command)
-                if success:
-                    output += f'Game saved as "{command}".\n'
-                else:
-                    output += "Failed to save game.\n"
-                game.command_processor.awaiting_save_name = False  # Clear the flag
-            else:
-                # Process other commands using the command processor
-                game.command_processor.process_command(command)
-            
-            flush_output()
+            emit_command_events(session_id, command, events.put)
+        finally:
+            events.put(None)
+    threading.Thread(target=run, name='command-stream', daemon=True).start()
 
-            # Capture any additional output
-            while not output_queue.empty():
-                output += output_queue.get()
+    def generate():
+        for item in iter(events.get, None):
+            yield format_event(*item)
 
-        finally:
-            restore_stdout()
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/command', methods=['POST'])
+def process_command():
+    """Process game commands."""
+    try:
+        data = request.get_json()
+        session_id = data.get('sessionId')
+        command = data.get('command', '').strip()
+
+        output = run_session_command(session_id, command)
+        if output is None:
+            return jsonify({'error': 'Session expired', 'output': 'Game session expired or not initialized.'}), 404
 
         return jsonify({'output': output})
 
+    except SessionConflict:
+        return jsonify({'error': 'Session conflict', 'output': 'Your game was changed by another request at the same time. Please try again.'}), 409
     except Exception as e:
         logger.error(f"Error in process_command: {str(e)}")
         logger.error(traceback.format_exc())
@@ -325,4 +486,5 @@ def process_command():
         }), 500
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=int(os.getenv("PORT", 8080)))
\ No newline at end of file
+    # Sessions are locked individually, so requests can be served concurrently
+    app.run(host='0.0.0.0', port=int(os.getenv("PORT", 8080)), threaded=True)
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Prefork server mode for the game's HTTP API.
+
+The master process compiles any out-of-date world bundles, builds every
+world template (importing the puzzle classes on the way) and decodes all
+their rooms, then freezes the garbage collector so collections never
+write to those shared objects. It then opens the listening socket and
+forks WORKERS processes that serve flask_driver's app from it. Workers
+share the world content copy-on-write, so adding one costs only the
+sessions it holds, not another copy of every world.
+
+Players can land on any worker, so sessions are shared through the session
+store, which defaults to a SQLite file in this mode (see SESSION_STORE in
+flask_driver.py). HOT_RELOAD is not supported here.
+
+    WORKERS=4 PORT=8080 python prefork_driver.py
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SESSION_STORE", "sqlite:///saves/sessions.db")
+if os.environ.get("HOT_RELOAD") == "1":
+    # The reloader thread would only run in the master, not in the workers
+    print("HOT_RELOAD is not supported with prefork workers; ignoring it", file=sys.stderr)
+os.environ["HOT_RELOAD"] = "0"
+
+from werkzeug.serving import make_server
+
+# Add src directory to path
+current_dir = Path(__file__).parent
+sys.path.append(str(current_dir / 'src'))
+from core.Game import Game
+from core.world.GameWorld import GameWorld
+from core.world.WorldTemplateCache import world_templates
+from core.loaders.WorldBundle import WorldBundle, LazyRoomMap
+from compile_worlds import compile_world
+
+logger = logging.getLogger(__name__)
+
+
+def compile_stale_bundles():
+    """Compile the bundles of worlds edited since they were last compiled."""
+    for world_id in Game._load_worlds_data():
+        world_path = GameWorld._get_world_path(world_id)
+        bundle_path = WorldBundle.get_bundle_path(world_path)
+        if not WorldBundle.is_fresh(bundle_path, world_path, GameWorld._get_config_path()):
+            try:
+                compile_world(world_id)
+                logger.info(f"Compiled bundle for world '{world_id}'")
+            except Exception as e:
+                logger.error(f"Failed to compile world '{world_id}': {str(e)}")
+
+
+def load_shared_content():
+    """Decode every room of the world templates so workers never add to them."""
+    for template in world_templates.get_templates().values():
+        if isinstance(template.rooms, LazyRoomMap):
+            for room_id in template.rooms:
+                template.rooms[room_id]
+    logger.info(f"Loaded {len(world_templates.get_templates())} world templates for sharing")
+
+
+def freeze_shared_content():
+    """Move everything allocated so far out of the garbage collector's reach."""
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Froze {gc.get_freeze_count()} objects before forking workers")
+
+
+def run_worker(listener, app):
+    """Serve requests from the shared listening socket until told to stop."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    host, port = listener.getsockname()[:2]
+    server = make_server(host, port, app, threaded=True, fd=listener.fileno())
+    logger.info(f"Worker {os.getpid()} serving on port {port}")
+    server.serve_forever()
+
+
+def spawn_worker(listener, app):
+    """Fork a worker process; returns its PID."""
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(listener, app)
+        except SystemExit as e:
+            code = e.code or 0
+        except BaseException:
+            logger.exception(f"Worker {os.getpid()} crashed")
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def main():
+    workers = int(os.getenv("WORKERS", os.cpu_count() or 2))
+    port = int(os.getenv("PORT", 8080))
+
+    compile_stale_bundles()
+    import flask_driver  # Builds the world templates and the session store
+    load_shared_content()
+
+    listener = socket.create_server(('0.0.0.0', port), backlog=1024)
+    freeze_shared_content()
+
+    children = set()
+    stopping = False
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    children.update(spawn_worker(listener, flask_driver.app) for _ in range(workers))
+    logger.info(f"Started {workers} workers on port {port}")
+
+    # Replace workers that die until asked to stop
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            logger.warning(f"Worker {pid} exited with status {status}; starting a new one")
+            time.sleep(1)
+            children.add(spawn_worker(listener, flask_driver.app))
+
+    listener.close()
+    logger.info("All workers stopped")
+
+
+if __name__ == '__main__':
+    main()
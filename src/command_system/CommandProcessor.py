@@ -1,8 +1,7 @@
-from typing import List, Dict, Callable, Tuple
+from typing import List, Dict, Callable, Optional, Tuple
 from command_system.MovementHandler import MovementManager
 from command_system.InventoryHandler import InventoryManager
 from command_system.DialogueHandler import DialogueManager
-import adventurelib as adv
 import time
 import logging
 
@@ -30,8 +29,8 @@ class CommandProcessor:
             "save": (self.handle_quick_save, []),
             "load": (self.handle_quick_load, []),
             "save game": (self.handle_named_save, []),
-            "load game": (self.handle_load_game, []),
-            "list saves": (self.handle_list_saves, []),
+            "load game": (self.handle_load_game, ["page"]),
+            "list saves": (self.handle_list_saves, ["page"]),
             "take": (self.handle_take, ["item_name"]),
             "get": (self.handle_take, ["item_name"]),
             "pick": (self.handle_take, ["item_name"]),
@@ -44,13 +43,16 @@ class CommandProcessor:
             "ask": (self.handle_ask, ["npc_name", "topic"]),
             "list worlds": (self.handle_list_worlds, []),
             "florbglorbule": (self.handle_dev_command, []),
-            "delete save": (self.handle_delete_save, [])
+            "delete save": (self.handle_delete_save, ["page"]),
+            "claim save": (self.handle_claim_save, ["page"])
         }
 
         # Internal flags for handling multi-step commands
         self.awaiting_save_name = False
         self.awaiting_load_choice = False
         self.awaiting_delete_choice = False
+        self.awaiting_claim_choice = False
+        self.awaiting_boss_choice = False
 
     def look(self):
         room = self.player.current_room
@@ -82,7 +84,15 @@ class CommandProcessor:
                         target_room_id
                     )
                 
-                target_room_name = target_room.name if hasattr(target_room, 'name') else str(target_room).split('/')[-1].replace('_', ' ').title()
+                if hasattr(target_room, 'name'):
+                    target_room_name = target_room.name
+                else:
+                    # Exits of rooms loaded on demand are room IDs
+                    target_room_name = None
+                    if self.game.current_world:
+                        target_room_name = self.game.current_world.get_room_name(target_room)
+                    if not target_room_name:
+                        target_room_name = str(target_room).split('/')[-1].replace('_', ' ').title()
                 exit_desc = f"{direction.capitalize()} (leads to {target_room_name}"
                 if is_locked:
                     exit_desc += " - LOCKED"
@@ -154,50 +164,69 @@ class CommandProcessor:
         self.display.print_message("Enter a name for your save:")
         self.awaiting_save_name = True
 
-    def handle_load_game(self):
+    def handle_load_game(self, args: Optional[List[str]] = None):
         """Start load game process"""
-        saves = self.game_state.list_saves()
-        if not saves:
-            self.display.print_message("No saved games found.")
+        if not self._show_saves("Available saves:", "load game", args):
             return
-            
-        self.display.print_message("Available saves:")
-        for i, save in enumerate(saves, 1):
-            timestamp = save['timestamp']
-            save_name = save['name']
-            self.display.print_message(f"{i}. {save_name} ({timestamp})")
-        
+
         self.display.print_message("\nEnter the number of the save to load:")
         self.awaiting_load_choice = True
 
-    def handle_list_saves(self):
-        """List all available saves"""
-        saves = self.game_state.list_saves()
-        if not saves:
-            self.display.print_message("No saved games found.")
-            return
-            
-        self.display.print_message("Available saves:")
-        for i, save in enumerate(saves, 1):
-            timestamp = save['timestamp']
-            save_name = save['name']
-            self.display.print_message(f"{i}. {save_name} ({timestamp})")
+    def handle_list_saves(self, args: Optional[List[str]] = None):
+        """List a page of the player's saves"""
+        self._show_saves("Available saves:", "list saves", args)
 
-    def handle_delete_save(self):
+    def handle_delete_save(self, args: Optional[List[str]] = None):
         """Start delete save process"""
-        saves = self.game.game_state.list_saves()
-        if not saves:
-            self.display.print_message("No saved games found.")
+        if not self._show_saves("Available saves to delete:", "delete save", args):
             return
-            
-        self.display.print_message("Available saves to delete:")
-        for i, save in enumerate(saves, 1):
+
+        self.display.print_message("\nEnter the number of the save to delete:")
+        self.awaiting_delete_choice = True
+
+    def handle_claim_save(self, args: Optional[List[str]] = None):
+        """Start claim save process"""
+        if not self.game_state.owner:
+            self.display.print_message("Saves that belong to no one are already listed with your saves.")
+            return
+        if not self._show_saves("Saves from before each player had their own:", "claim save", args, unclaimed=True):
+            return
+
+        self.display.print_message("\nEnter the number of the save to claim:")
+        self.awaiting_claim_choice = True
+
+    def _show_saves(self, heading: str, command: str, args: Optional[List[str]], unclaimed: bool = False) -> bool:
+        """Show a page of the player's (or the unclaimed) saves, numbered for choosing one; returns whether any were shown."""
+        try:
+            page = int(args[0]) if args else 1
+        except ValueError:
+            self.display.print_message("Please enter a page number.")
+            return False
+
+        total = self.game_state.count_saves(unclaimed)
+        if not total:
+            if unclaimed:
+                self.display.print_message("There are no saves to claim.")
+                return False
+            self.display.print_message("No saved games found.")
+            if self.game_state.owner and self.game_state.count_saves(unclaimed=True):
+                self.display.print_message("Saves from before each player had their own can be claimed with 'claim save'.")
+            return False
+        per_page = self.game_state.SAVES_PER_PAGE
+        pages = (total + per_page - 1) // per_page
+        if not 1 <= page <= pages:
+            self.display.print_message(f"Please enter a page from 1 to {pages}.")
+            return False
+
+        self.display.print_message(heading)
+        first = (page - 1) * per_page + 1
+        for i, save in enumerate(self.game_state.list_saves(page, unclaimed), first):
             timestamp = save['timestamp']
             save_name = save['name']
             self.display.print_message(f"{i}. {save_name} ({timestamp})")
-        
-        self.display.print_message("\nEnter the number of the save to delete:")
-        self.awaiting_delete_choice = True
+        if pages > 1:
+            self.display.print_message(f"Page {page} of {pages}. Type '{command} <page>' for another page.")
+        return True
 
     def print_help(self):
         sections = [
@@ -211,6 +240,7 @@ class CommandProcessor:
                 ("save game", "Save game with custom name"),
                 ("load game", "Load a saved game"),
                 ("list saves", "List all saved games"),
+                ("claim save", "Claim a save from before each player had their own"),
                 ("save", "Quick save"),
                 ("load", "Quick load last save")
             ]),
@@ -245,11 +275,11 @@ class CommandProcessor:
         first_section = True
         for section, commands in sections:
             if not first_section:
-                adv.say("")
+                self.display.say("")
             first_section = False
             self.display.print_help_section(section)
             for cmd, desc in commands:
-                adv.say(f"• {cmd:<25} - {desc}")
+                self.display.say(f"• {cmd:<25} - {desc}")
 
     def handle_take(self, args: List[str]):
         item_name = ' '.join(args)
@@ -294,10 +324,11 @@ class CommandProcessor:
         if world_name.lower().startswith('to '):
             world_name = world_name[3:]
 
+        # Match on names only so just the chosen world gets loaded
         target_world = None
-        for name, world in self.game.worlds.items():
+        for name in self.game.worlds:
             if name.lower() == world_name.lower():
-                target_world = world
+                target_world = self.game.worlds.get(name)
                 world_name = name
                 break
 
@@ -346,9 +377,9 @@ class CommandProcessor:
                 room_name = room.name.lower().replace(' ', '_').replace("'", "")
                 return f"level_one/{room_name}"
                 
-            for room_path, world_room in current_world.rooms.items():
-                if world_room == room:
-                    return room_path
+            room_path = current_world.get_room_id(room)
+            if room_path is not None:
+                return room_path
                     
             room_name = room.name.lower().replace(' ', '_').replace("'", "")
             return f"level_one/{room_name}"
@@ -357,6 +388,10 @@ class CommandProcessor:
         """Handle user input and execute appropriate commands."""
 
         # Handle multi-step command states
+        if self.awaiting_boss_choice:
+            self.game.boss_battle.handle_choice(command)
+            return
+
         if self.awaiting_save_name:
             self.awaiting_save_name = False
             success = self.game_state.save_game(command)
@@ -368,11 +403,14 @@ class CommandProcessor:
 
         if self.awaiting_load_choice:
             self.awaiting_load_choice = False
+            if command.lower().startswith("load game"):
+                self.handle_load_game(command.split()[2:])
+                return
             try:
                 choice = int(command)
-                saves = self.game_state.list_saves()
-                if 1 <= choice <= len(saves):
-                    save_name = saves[choice-1]['name']
+                save = self.game_state.get_save(choice)
+                if save:
+                    save_name = save['name']
                     if self.game_state.load_game(save_name):
                         self.look()
                         self.display.print_message(f'Loaded save game "{save_name}"')
@@ -386,6 +424,9 @@ class CommandProcessor:
 
         if self.awaiting_delete_choice:
             self.awaiting_delete_choice = False
+            if command.lower().startswith("delete save"):
+                self.handle_delete_save(command.split()[2:])
+                return
             try:
                 choice = int(command)
                 success, message = self.game_state.delete_game_save(choice)
@@ -394,6 +435,19 @@ class CommandProcessor:
                 self.display.print_message("Please enter a number.")
             return
 
+        if self.awaiting_claim_choice:
+            self.awaiting_claim_choice = False
+            if command.lower().startswith("claim save"):
+                self.handle_claim_save(command.split()[2:])
+                return
+            try:
+                choice = int(command)
+                success, message = self.game_state.claim_save(choice)
+                self.display.print_message(message)
+            except ValueError:
+                self.display.print_message("Please enter a number.")
+            return
+
         # Process standard commands
         parts = command.lower().split()
         matched_command = None
@@ -15,11 +15,7 @@ class MovementManager:
                     target_room_id = target_room
                 else:
                     # If it's a Room object, get its ID from the world's rooms
-                    target_room_id = None
-                    for room_id, room in self.game.current_world.rooms.items():
-                        if room == target_room:
-                            target_room_id = room_id
-                            break
+                    target_room_id = self.game.current_world.get_room_id(target_room)
                     if target_room_id is None:
                         target_room_id = target_room.name  # Fallback to name if not found
 
@@ -86,8 +82,13 @@ class MovementManager:
         target_world = world_name.lower().replace(" ", "")
         available_worlds = self.game.worlds
         
-        for name, world in available_worlds.items():
+        # Match on names only so just the chosen world gets loaded
+        for name in available_worlds:
             if name.lower().replace(" ", "") == target_world:
+                world = available_worlds.get(name)
+                if world is None:
+                    break
+                world.initialize(self.game.game_state)
                 self.game.current_world = world
                 starting_room = world.get_starting_room()
                 self.player.move_to(starting_room)
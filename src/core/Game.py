@@ -3,13 +3,18 @@ Path: src/core/game.py
 """
 
 import json
+import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 import traceback
 import adventurelib as adv
 
 from core.world.GameWorld import GameWorld
+from core.world.WorldTemplateCache import world_templates
+from core.world.WorldRegistry import WorldRegistry
 from core.entities.Player import Player
 from command_system.CommandProcessor import CommandProcessor
 from core.systems.DisplayManager import DisplayManager as Display
@@ -20,6 +25,10 @@ from core.world.DirectionManager import initialize_directions
 from core.systems.BossBattle import BossBattle
 
 class Game:
+    # Have preload_worlds() build world templates on a thread pool instead
+    # of one after another; it runs once at startup, not for every game
+    parallel_world_loading: bool = False
+
     def __init__(self):
         # Existing initialization
         self.display = Display()
@@ -34,7 +43,7 @@ class Game:
 
     def serialize(self):
         return {
-            'worlds': {name: world.name for name, world in self.worlds.items()},
+            'worlds': {name: name for name in self.worlds},
             'current_world': self.current_world.name if self.current_world else None,
             'is_running': self.is_running
         }
@@ -47,21 +56,18 @@ class Game:
             self.current_world = self.worlds[current_world_name]
             self.current_world.initialize(self.game_state)
             
-    def setup(self):
-        """Initialize game state and starting location."""
-        # Load all worlds if not already loaded
+    def setup(self, quiet: bool = False):
+        """Initialize game state and starting location.
+
+        Unless quiet, the intro and the starting room are shown.
+        """
+        # Register all worlds if not already done; each loads on first use
         if not self.worlds:
             self.load_all_worlds()
         
-        # Try to get Intro World
-        self.current_world = self.worlds.get("Intro World")
-        if not self.current_world:
-            # If Intro World not found, try to use any available world
-            if self.worlds:
-                self.current_world = next(iter(self.worlds.values()))
-            else:
-                raise ValueError("No game worlds could be loaded. Please check your game files.")
-                
+        # Intro World, or any available world if there is none
+        self.current_world = self.worlds[self._get_starting_world_name()]
+
         # Initialize the current world
         self.current_world.initialize(self.game_state)
             
@@ -71,33 +77,80 @@ class Game:
             raise ValueError(f"No starting room found in {self.current_world.name}. Please check world configuration.")
             
         self.player.move_to(starting_room)
-        self.intro()
-        self.command_processor.look()
+        if not quiet:
+            self.intro()
+            self.command_processor.look()
 
     def load_all_worlds(self):
-        """Load all game worlds from data files."""
+        """Register all game worlds from data files; each one is loaded when first used."""
         worlds_data = self._load_worlds_data()
-        for world_id, world_info in worlds_data.items():
-            try:
-                # Create and load world
-                new_world = GameWorld(world_id)
-                new_world.load_world()
-                
-                # Store world using its configured name
-                self.worlds[new_world.name] = new_world
-                self.display.print_message(f"Successfully loaded world: {new_world.name}")
-                
-            except Exception as e:
-                self.display.print_message(f"Error loading world '{world_id}':")
-                self.display.print_message(traceback.format_exc())
-                continue
+
+        # Worlds are stored using their configured names
+        self.worlds = WorldRegistry(worlds_data)
 
         if not self.worlds:
             self.display.print_simple_message("Warning: No game worlds could be loaded. Please check your data files.")
             exit(1)
 
-    def _load_worlds_data(self):
-        """Load world configuration data from worlds.json."""
+        # Worlds load on first use, so check now that the game can start at all
+        starting_world = self._get_starting_world_name()
+        try:
+            self.worlds[starting_world]
+        except KeyError:
+            raise ValueError(f"The starting world '{starting_world}' could not be loaded. Please check your game files.")
+
+    def _get_starting_world_name(self) -> str:
+        """Get the name of the world new games start in."""
+        return "Intro World" if "Intro World" in self.worlds else next(iter(self.worlds))
+
+    @classmethod
+    def preload_worlds(cls, parallel: Optional[bool] = None, max_workers: Optional[int] = None) -> Dict[str, float]:
+        """
+        Build the shared world templates so later sessions only copy them.
+
+        With parallel=True (or Game.parallel_world_loading set) the worlds are
+        built concurrently on a thread pool. A world that fails to load is
+        logged and skipped without affecting the others. Returns the build
+        time in milliseconds of each world that loaded.
+        """
+        if parallel is None:
+            parallel = cls.parallel_world_loading
+        world_ids = list(cls._load_worlds_data())
+        logger = logging.getLogger('world')
+        start = time.perf_counter()
+
+        def preload(world_id):
+            try:
+                world_templates.get_template(world_id, GameWorld.build_template)
+                return True
+            except Exception:
+                logger.error(f"Error preloading world '{world_id}':\n{traceback.format_exc()}")
+                return False
+
+        if parallel and len(world_ids) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers or len(world_ids),
+                                    thread_name_prefix='world-loader') as executor:
+                loaded = list(executor.map(preload, world_ids))
+        else:
+            loaded = [preload(world_id) for world_id in world_ids]
+
+        timings = {world_id: world_templates.build_times.get(world_id, 0.0)
+                   for world_id, ok in zip(world_ids, loaded) if ok}
+        for world_id, elapsed in timings.items():
+            logger.info(f"World '{world_id}' ready in {elapsed:.1f} ms")
+        logger.info(f"Preloaded {len(timings)}/{len(world_ids)} worlds in "
+                    f"{(time.perf_counter() - start) * 1000:.1f} ms"
+                    f"{' (parallel)' if parallel else ''}")
+        return timings
+
+    @staticmethod
+    def _load_worlds_data():
+        """Load world configuration data from worlds.json (cached per process)."""
+        return world_templates.get_worlds_data(Game._read_worlds_file)
+
+    @staticmethod
+    def _read_worlds_file():
+        """Read and parse worlds.json from the data directory."""
         # Go up 3 levels from src/core/ to project root
         base_path = Path(__file__).parent.parent.parent  # From src/core/ to project root
         data_path = base_path / 'data'
@@ -124,6 +177,7 @@ class Game:
                 user_input = input("> ").strip()
                 if not user_input:
                     continue
+                self.apply_content_updates()
                 self.command_processor.process_command(user_input)
                 self.boss_battle.trigger_battle()
             except (EOFError, KeyboardInterrupt):
@@ -132,6 +186,12 @@ class Game:
                 self.display.print_message(f"An error occurred: {str(e)}")
                 self.display.print_message(traceback.format_exc())  # Print full traceback for debugging
 
+    def apply_content_updates(self):
+        """Apply world content edits queued since the last command (see ContentReloader)."""
+        if self.worlds:
+            for world in self.worlds.loaded_worlds():
+                world.apply_updates()
+
     def quit(self):
         """Clean up and exit the game."""
         self.is_running = False
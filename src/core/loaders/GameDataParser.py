@@ -1,9 +1,76 @@
+import hashlib
 import json
 import logging
+import os
+import threading
 from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .WorldManifest import WorldManifest
 
 logger = logging.getLogger(__name__)
 
+class ParseCache:
+    """
+    Process-wide cache of parsed JSON data files.
+
+    Entries are keyed by path and checked against the file's modification
+    time and size, so each file is read and decoded once for as long as it
+    is unchanged. With hash_contents enabled, a file whose stat changed is
+    read again but only re-decoded if its content hash differs (e.g. after
+    a checkout that rewrites identical files).
+
+    Cached data is shared by every caller and must be treated as read-only.
+    """
+    def __init__(self, hash_contents: bool = False):
+        self.hash_contents = hash_contents
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[int, int, Optional[str], Any]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, file_path: Path) -> Any:
+        """Get the parsed contents of a JSON file, decoding it only if it changed."""
+        key = os.fspath(file_path)
+        stat = os.stat(key)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            with self._lock:
+                self.hits += 1
+            return entry[3]
+
+        with open(key, 'rb') as file:
+            raw = file.read()
+        digest = hashlib.sha256(raw).hexdigest() if self.hash_contents else None
+
+        unchanged = entry is not None and digest is not None and entry[2] == digest
+        data = entry[3] if unchanged else json.loads(raw)
+
+        # Loader threads share the cache; the counters are only updated under the lock
+        with self._lock:
+            if unchanged:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, digest, data)
+        return data
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and the number of cached files."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'files': len(self._entries)}
+
+    def clear(self) -> None:
+        """Drop all cached data and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by every loader in the process
+parse_cache = ParseCache()
+
 class GameDataParser:
     """Handles JSON file operations and basic path management."""
     
@@ -14,10 +81,9 @@ class GameDataParser:
 
     @staticmethod
     def load_json_file(file_path: Path) -> dict:
-        """Load and parse a JSON file."""
+        """Load and parse a JSON file (cached until the file changes; do not modify the result)."""
         try:
-            with open(file_path, 'r') as file:
-                return json.load(file)
+            return parse_cache.load(file_path)
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in {file_path}: {str(e)}")
         except FileNotFoundError:
@@ -26,8 +92,7 @@ class GameDataParser:
     @staticmethod
     def get_level_dirs(world_path: Path) -> list:
         """Get all level directories in a world."""
-        return [d for d in world_path.iterdir() 
-                if d.is_dir() and d.name.startswith('level_')]
+        return WorldManifest.scan(world_path).get_level_dirs()
 
     @staticmethod
     def construct_key(name: str, level: str = None) -> str:
@@ -17,68 +17,78 @@ class GameEntityFactory:
         """Create an item from JSON data."""
         try:
             item_data = self.json_loader.load_json_file(file_path)
-            name = item_data['name']
+            item = self.build_item(item_data)
             
-            item = adv.Item(name)
-            item.description = item_data.get('description', '')
-            
-            # Add additional properties
-            for key, value in item_data.get('properties', {}).items():
-                setattr(item, key, value)
-            
-            item_key = self.json_loader.construct_key(name, level)
+            item_key = self.json_loader.construct_key(item.name, level)
             self.world.items[item_key] = item
-            self.world.item_names[item_key] = name
+            self.world.item_names[item_key] = item.name
             
         except Exception as e:
             logger.error(f"Error creating item from {file_path}: {str(e)}")
             raise
 
+    def build_item(self, item_data: dict) -> adv.Item:
+        """Build an item object from parsed JSON data."""
+        item = adv.Item(item_data['name'])
+        item.description = item_data.get('description', '')
+        
+        # Add additional properties
+        for key, value in item_data.get('properties', {}).items():
+            setattr(item, key, value)
+        return item
+
     def create_npc(self, file_path: Path, level: str = None) -> None:
         """Create an NPC from JSON data."""
         try:
             npc_data = self.json_loader.load_json_file(file_path)
-            name = npc_data['name']
-            npc_id = npc_data.get('id', name)  # Use id if available, fallback to name
-            description = npc_data.get('description', '')
-            dialogue = npc_data.get('dialogue', {})
-            
-            # Get greeting/default dialogue
-            default_dialogue = dialogue.get('greeting') or dialogue.get('default') or "Hello!"
-            npc = NPC(name, default_dialogue)
-            npc.description = description
-            
-            # Store the entire dialogue structure for puzzle use
-            npc.dialogue_data = dialogue
-            
-            # Add items
-            for item_name in npc_data.get('items', []):
-                item_key = self.json_loader.construct_key(item_name, level)
-                if item_key in self.world.items:
-                    npc.inventory.add(self.world.items[item_key])
+            npc = self.build_npc(npc_data, level)
             
             # Use id for the key instead of name
-            npc_key = self.json_loader.construct_key(npc_id, level)
+            npc_key = self.get_npc_key(npc_data, level)
             self.world.npcs[npc_key] = npc
             
         except Exception as e:
             logger.error(f"Error creating NPC from {file_path}: {str(e)}")
             raise
 
+    def build_npc(self, npc_data: dict, level: str = None) -> NPC:
+        """Build an NPC object from parsed JSON data, giving it the world's items."""
+        name = npc_data['name']
+        description = npc_data.get('description', '')
+        dialogue = npc_data.get('dialogue', {})
+        
+        # Get greeting/default dialogue
+        default_dialogue = dialogue.get('greeting') or dialogue.get('default') or "Hello!"
+        npc = NPC(name, default_dialogue)
+        npc.description = description
+        
+        # Store the entire dialogue structure for puzzle use
+        npc.dialogue_data = dialogue
+        
+        # Add items
+        for item_name in npc_data.get('items', []):
+            item_key = self.json_loader.construct_key(item_name, level)
+            if item_key in self.world.items:
+                npc.inventory.add(self.world.items[item_key])
+        return npc
+
+    def get_npc_key(self, npc_data: dict, level: str = None) -> str:
+        """Get the key an NPC is stored under (its id if available, else its name)."""
+        npc_id = npc_data.get('id', npc_data['name'])
+        return self.json_loader.construct_key(npc_id, level)
+
     def create_room(self, file_path: Path, level: str = None) -> None:
         """Create a room from JSON data."""
         try:
             room_data = self.json_loader.load_json_file(file_path)
-            room = adv.Room(room_data['description'])
-            room.name = room_data['name']
-            room.items = adv.Bag()
-            room.npcs = []
+            room = self.build_room(room_data)
             
             # Store both the file stem and normalized name for lookup
-            file_id = f"{level}/{file_path.stem}" if level else file_path.stem
-            normalized_name = self.json_loader.normalize_name(room.name)
-            room_id = f"{level}/{normalized_name}" if level else normalized_name
+            file_id, room_id = self.get_room_ids(file_path, room.name, level)
             
+            # Rooms know their primary ID so lookups don't need to scan the world
+            room.id = file_id
+
             # Store room under both IDs for compatibility
             self.world.rooms[file_id] = room
             if file_id != room_id:
@@ -86,4 +96,19 @@ class GameEntityFactory:
             
         except Exception as e:
             logger.error(f"Error creating room from {file_path}: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    def build_room(self, room_data: dict) -> adv.Room:
+        """Build an empty, unconnected room from parsed JSON data."""
+        room = adv.Room(room_data['description'])
+        room.name = room_data['name']
+        room.items = adv.Bag()
+        room.npcs = []
+        return room
+
+    def get_room_ids(self, file_path: Path, name: str, level: str = None) -> tuple:
+        """Get a room's file-based ID and its name-based ID."""
+        file_id = f"{level}/{file_path.stem}" if level else file_path.stem
+        normalized_name = self.json_loader.normalize_name(name)
+        room_id = f"{level}/{normalized_name}" if level else normalized_name
+        return file_id, room_id
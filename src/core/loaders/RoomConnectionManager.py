@@ -1,6 +1,9 @@
 import logging
 from pathlib import Path
+from typing import Optional
 from .GameDataParser import GameDataParser
+from .WorldLoadReport import WorldLoadReport
+from .WorldManifest import WorldManifest
 from adventurelib import Room
 
 logger = logging.getLogger('world')
@@ -12,43 +15,90 @@ class RoomConnectionManager:
         self.world = world
         self.json_loader = GameDataParser()
 
-    def setup_room_connections(self, base_path: Path) -> None:
+    def setup_room_connections(self, base_path: Path, manifest: Optional[WorldManifest] = None) -> None:
         """Set up room exits and connections."""
-        
-        # First pass: Set up basic exits
+        report = WorldLoadReport()
+        if manifest is None:
+            manifest = WorldManifest.scan(base_path)
+
+        # First pass: Read every room file once and add its contents
+        rooms_data = {}
         for room_id, room in list(self.world.rooms.items()):  # Use list to allow dict modification
             try:
-                room_data = self._get_room_data(room_id, base_path)
-                self._setup_exits(room, room_data, room_id)
-                self._populate_room(room, room_data, room_id)
+                room_data = self._get_room_data(room_id, base_path, manifest)
+                rooms_data[room_id] = room_data
+                self._populate_room(room, room_data, room_id, report)
             except FileNotFoundError as e:
                 logger.warning(f"Room file not found for {room_id}, removing room: {str(e)}")
+                report.missing_rooms.append(room_id)
                 del self.world.rooms[room_id]
             except Exception as e:
                 logger.error(f"Error setting up room {room_id}: {str(e)}")
                 raise
-        
-        # Second pass: Clean up invalid exits
-        for room_id, room in list(self.world.rooms.items()):
-            for exit_dir in room.exits():
-                target_room = getattr(room, exit_dir)
-                if target_room and target_room not in self.world.rooms.values():
-                    logger.warning(f"Removing invalid exit {exit_dir} from room {room_id}")
-                    setattr(room, exit_dir, None)
-
-    def _get_room_data(self, room_id: str, base_path: Path) -> dict:
+
+        # Second pass: Resolve exits against an index of the rooms that
+        # survived the first pass, so every exit is a dictionary lookup
+        room_index = self._build_room_index()
+        for room_id, room_data in rooms_data.items():
+            try:
+                self._setup_exits(self.world.rooms[room_id], room_data, room_id, room_index, report)
+            except Exception as e:
+                logger.error(f"Error setting up room {room_id}: {str(e)}")
+                raise
+
+        if not report.is_clean:
+            logger.warning(f"World {self.world.world_id} loaded with {report.summary()}")
+        self.world.load_report = report
+
+    def refresh_room(self, room, room_data: dict, room_id: str) -> list:
+        """
+        Re-apply edited data to a room of an already connected world.
+
+        Only this room's contents, stairs and exits are rebuilt; exits that
+        other rooms declare towards it are left alone. Returns the rooms
+        whose exits may have changed: the room itself and its new targets.
+        """
+        report = self.world.load_report
+        for entries in (report.dangling_exits, report.missing_items, report.missing_npcs):
+            entries[:] = [entry for entry in entries if entry[0] != room_id]
+
+        for attr in list(Room._directions) + ['stairs_up', 'stairs_down']:
+            room.__dict__.pop(attr, None)
+        room.items.clear()
+        room.npcs.clear()
+
+        # Exit resolution tracks the level being processed on the world
+        current_level = self.world.current_level
+        try:
+            self._populate_room(room, room_data, room_id, report)
+            self._setup_exits(room, room_data, room_id, self._build_room_index(), report)
+        finally:
+            self.world.current_level = current_level
+
+        return [room] + [getattr(room, direction) for direction in room.exits()]
+
+    def _build_room_index(self) -> dict:
+        """Map every normalized room ID to the key the room is stored under."""
+        room_index = {}
+        for actual_id in self.world.rooms.keys():
+            normalized_id = actual_id.lower().replace(' ', '_').replace("'", '')
+            room_index[normalized_id] = actual_id
+        return room_index
+
+    def _get_room_data(self, room_id: str, base_path: Path, manifest: WorldManifest) -> dict:
         """Get room data from file."""
         try:
             if '/' in room_id:
                 level, room_name = room_id.split('/')
-                # Try the original filename first
+                # Try the original filename first; it was already parsed
+                # when the room was created, so this is a cache hit
                 path = base_path / level / 'rooms' / f"{room_name}.json"
-                if path.exists():
+                if manifest.has_file(path):
                     return self.json_loader.load_json_file(path)
                 
                 # If that fails, try with normalized name
                 normalized_path = base_path / level / 'rooms' / f"{self.json_loader.normalize_name(room_name)}.json"
-                if normalized_path.exists():
+                if manifest.has_file(normalized_path):
                     return self.json_loader.load_json_file(normalized_path)
                     
                 raise FileNotFoundError(f"Could not find room file for {room_id}")
@@ -59,18 +109,12 @@ class RoomConnectionManager:
             logger.error(f"Error loading room data for {room_id}: {str(e)}")
             raise
 
-    def _setup_exits(self, room, room_data: dict, room_id: str) -> None:
+    def _setup_exits(self, room, room_data: dict, room_id: str, room_index: dict, report: WorldLoadReport) -> None:
         """Set up room exits."""
         # Get the current level from the room_id
         current_level = room_id.split('/')[0] if '/' in room_id else 'level_one'
         self.world.current_level = current_level
         
-        # Create a single normalized room mapping
-        normalized_rooms = {}
-        for actual_id in self.world.rooms.keys():
-            normalized_id = self.world._normalize_room_id(actual_id)
-            normalized_rooms[normalized_id] = actual_id
-        
         # Handle normal exits
         for direction, target_room_id in room_data.get('exits', {}).items():
             if direction == 'portal':  # Skip portal exits
@@ -81,22 +125,31 @@ class RoomConnectionManager:
                 continue
             
             # Use the world's normalization with current level context
-            self.world.current_level = current_level
             normalized_target = self.world._normalize_room_id(target_room_id)
             
-            if normalized_target in normalized_rooms:
-                actual_key = normalized_rooms[normalized_target]
+            # Rooms outside any level are indexed by their bare name
+            actual_key = room_index.get(normalized_target)
+            if actual_key is None:
+                actual_key = room_index.get(normalized_target.split('/', 1)[-1])
+
+            if actual_key is not None:
                 setattr(room, direction, self.world.rooms[actual_key])
             else:
                 logger.warning(f"Could not find room '{normalized_target}' for exit '{direction}' in room '{room_id}'")
+                report.dangling_exits.append((room_id, direction, str(target_room_id)))
         
-        # Handle stairs as properties instead of exits
-        if 'stairs_up' in room_data:
-            room.stairs_up = room_data['stairs_up']
-        if 'stairs_down' in room_data:
-            room.stairs_down = room_data['stairs_down']
+        # Handle stairs as properties instead of exits; they stay room IDs
+        # and are looked up when used, so only check that they resolve
+        for stairs in ('stairs_up', 'stairs_down'):
+            if stairs not in room_data:
+                continue
+            setattr(room, stairs, room_data[stairs])
+            target_room_id = room_data[stairs]
+            if target_room_id and self.world._normalize_room_id(target_room_id) not in room_index:
+                logger.warning(f"Could not find room '{target_room_id}' for {stairs} in room '{room_id}'")
+                report.dangling_exits.append((room_id, stairs, str(target_room_id)))
 
-    def _populate_room(self, room, room_data: dict, room_id: str) -> None:
+    def _populate_room(self, room, room_data: dict, room_id: str, report: WorldLoadReport) -> None:
         """Populate room with items and NPCs."""
         level = room_id.split('/')[0] if '/' in room_id else None
         
@@ -107,6 +160,7 @@ class RoomConnectionManager:
                 room.items.add(self.world.items[item_key])
             else:
                 logger.warning(f"Item '{item_name}' not found for room '{room.name}'")
+                report.missing_items.append((room_id, item_name))
         
         # Add NPCs
         for npc_name in room_data.get('npcs', []):
@@ -117,6 +171,7 @@ class RoomConnectionManager:
                 room.npcs.append(self.world.npcs[npc_name])
             else:
                 logger.warning(f"NPC '{npc_name}' not found for room '{room.name}'")
+                report.missing_npcs.append((room_id, npc_name))
 
     def _normalize_room_id(self, target_room_id: str, current_room_id: str) -> str:
         """Normalize room ID while preserving path structure."""
@@ -0,0 +1,304 @@
+import logging
+import marshal
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import adventurelib as adv
+from ..entities.NPC import NPC
+from .WorldLoadReport import WorldLoadReport
+from .WorldManifest import WorldManifest
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_MAGIC = b'TZWB'
+BUNDLE_VERSION = 2
+BUNDLE_FILENAME = 'world.bundle'
+
+# magic, format version, size of the marshalled index that follows
+_HEADER = struct.Struct('<4sHI')
+
+# Room attributes handled explicitly when (de)serializing a room
+_ROOM_FIELDS = {'name', 'description', 'items', 'npcs'}
+
+
+class WorldBundle:
+    """
+    Precompiled, single-file form of a world's data directory.
+
+    A bundle holds every item, NPC and room of a world after the regular
+    JSON loaders have run, with exits, stairs and component keys already
+    resolved, so loading it needs one file read instead of hundreds.
+
+    Layout: a fixed header, a marshalled index (config, items, NPCs and the
+    byte span of every room), then one marshalled record per room. The file
+    is memory-mapped so rooms can be decoded individually on demand.
+    """
+
+    def __init__(self, path: Path, buffer: mmap.mmap, index: dict):
+        self.path = path
+        self.buffer = buffer
+        self.index = index
+
+        # Every room ID (file stem and normalized name) -> room record number
+        self.room_numbers: Dict[str, int] = dict(index['room_ids'])
+
+    @classmethod
+    def open(cls, bundle_path: Path) -> Optional['WorldBundle']:
+        """Memory-map a bundle, returning None if it is not a usable bundle."""
+        try:
+            with open(bundle_path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, index_size = _HEADER.unpack_from(buffer)
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                logger.warning(f"Ignoring bundle {bundle_path} (version {version})")
+                buffer.close()
+                return None
+            index = marshal.loads(buffer[_HEADER.size:_HEADER.size + index_size])
+            return cls(bundle_path, buffer, index)
+        except (OSError, ValueError, EOFError, TypeError, struct.error) as e:
+            logger.warning(f"Could not read bundle {bundle_path}: {str(e)}")
+            return None
+
+    def read_room(self, number: int) -> dict:
+        """Decode a single room record."""
+        offset, length = self.index['room_spans'][number]
+        return marshal.loads(self.buffer[offset:offset + length])
+
+    def build_items(self) -> Dict[str, adv.Item]:
+        """Create the world's items."""
+        items = {}
+        for key, name, description, properties in self.index['items']:
+            item = adv.Item(name)
+            item.description = description
+            for attr, value in properties.items():
+                setattr(item, attr, value)
+            items[key] = item
+        return items
+
+    def build_npcs(self, items: Dict[str, adv.Item]) -> Dict[str, NPC]:
+        """Create the world's NPCs, giving them their items."""
+        npcs = {}
+        for key, name, description, dialogue, dialogue_data, state, inventory in self.index['npcs']:
+            npc = NPC(name, description)
+            npc.dialogue = dialogue
+            npc.dialogue_data = dialogue_data
+            npc.state = state
+            for item_key in inventory:
+                npc.inventory.add(items[item_key])
+            npcs[key] = npc
+        return npcs
+
+    def build_room(self, number: int, items: Dict[str, adv.Item], npcs: Dict[str, NPC]) -> adv.Room:
+        """Create a single room; exits are left as room ID strings."""
+        room_data = self.read_room(number)
+        room = adv.Room(room_data['description'])
+        room.name = room_data['name']
+        room.items = adv.Bag(items[key] for key in room_data['items'])
+        room.npcs = [npcs[key] for key in room_data['npcs']]
+        for attr, value in room_data['attributes'].items():
+            setattr(room, attr, value)
+        for direction, target_id in room_data['exits'].items():
+            setattr(room, direction, target_id)
+        return room
+
+    def apply(self, world, lazy: bool = True) -> None:
+        """
+        Populate a world's items, NPCs and rooms from this bundle.
+
+        With lazy=True the world's rooms become a LazyRoomMap that decodes
+        rooms from the mapped file only when they are first requested.
+        Otherwise every room is built immediately and exits are linked to
+        room objects, exactly as the JSON loaders would leave them.
+        """
+        world.items = self.build_items()
+        world.item_names = self.index['item_names']
+        world.npcs = self.build_npcs(world.items)
+        world.current_level = self.index['current_level']
+        world.load_report = WorldLoadReport.from_dict(self.index.get('load_report', {}))
+
+        if lazy:
+            world.rooms = LazyRoomMap(self, world.items, world.npcs)
+            return
+
+        rooms = [self.build_room(number, world.items, world.npcs)
+                 for number in range(len(self.index['room_spans']))]
+
+        # Link exits exactly as compiled; going through Room.__setattr__
+        # would also rewrite the reverse exit of the target room
+        for room in rooms:
+            for direction in adv.Room._directions:
+                target_id = room.__dict__.get(direction)
+                if isinstance(target_id, str):
+                    object.__setattr__(room, direction, rooms[self.room_numbers[target_id]])
+
+        world.rooms = {room_id: rooms[number] for room_id, number in self.index['room_ids']}
+
+    @staticmethod
+    def get_bundle_path(world_path: Path) -> Path:
+        """Get the bundle file location for a world directory."""
+        return world_path / BUNDLE_FILENAME
+
+    @staticmethod
+    def compile(world) -> dict:
+        """Convert a world loaded from JSON into bundle data."""
+        item_keys = {id(item): key for key, item in world.items.items()}
+
+        items = [
+            (key, item.name, getattr(item, 'description', ''), {
+                attr: value for attr, value in vars(item).items()
+                if attr not in ('name', 'aliases', 'description')
+            })
+            for key, item in world.items.items()
+        ]
+
+        npc_keys = {id(npc): key for key, npc in world.npcs.items()}
+        npcs = [
+            (key, npc.name, npc.description, npc.dialogue,
+             getattr(npc, 'dialogue_data', {}), npc.state,
+             [item_keys[id(item)] for item in npc.inventory if id(item) in item_keys])
+            for key, npc in world.npcs.items()
+        ]
+
+        # Rooms are stored once and referenced by number from every ID;
+        # exits point at the first ID a room is stored under
+        room_numbers = {}
+        room_ids = []
+        canonical_ids = {}
+        for room_id, room in world.rooms.items():
+            if id(room) not in room_numbers:
+                room_numbers[id(room)] = len(room_numbers)
+                canonical_ids[id(room)] = room_id
+            room_ids.append((room_id, room_numbers[id(room)]))
+
+        rooms = [None] * len(room_numbers)
+        for room in world.rooms.values():
+            number = room_numbers[id(room)]
+            if rooms[number] is not None:
+                continue
+            exits = {}
+            extra = {}
+            for attr, value in vars(room).items():
+                if attr in _ROOM_FIELDS:
+                    continue
+                if isinstance(value, adv.Room):
+                    exits[attr] = canonical_ids[id(value)]
+                else:
+                    extra[attr] = value
+            rooms[number] = {
+                'name': room.name,
+                'description': room.description,
+                'exits': exits,
+                'attributes': extra,
+                'items': [item_keys[id(item)] for item in room.items if id(item) in item_keys],
+                'npcs': [npc_keys[id(npc)] for npc in getattr(room, 'npcs', []) if id(npc) in npc_keys],
+            }
+
+        return {
+            'world_id': world.world_id,
+            'config': vars(world.config),
+            'current_level': world.current_level,
+            'item_names': world.item_names,
+            'items': items,
+            'npcs': npcs,
+            'rooms': rooms,
+            'room_ids': room_ids,
+            'load_report': world.load_report.to_dict(),
+        }
+
+    @staticmethod
+    def write(bundle_path: Path, data: dict) -> None:
+        """Write bundle data to disk, replacing any existing bundle atomically."""
+        records = [marshal.dumps(room) for room in data['rooms']]
+        index = {key: value for key, value in data.items() if key != 'rooms'}
+        index['room_names'] = [room['name'] for room in data['rooms']]
+
+        # Room spans are absolute offsets, which depend on the index size
+        # itself; the index only grows with larger offsets, so settle it
+        spans = [(0, len(record)) for record in records]
+        while True:
+            index['room_spans'] = spans
+            index_bytes = marshal.dumps(index)
+            offset = _HEADER.size + len(index_bytes)
+            new_spans = []
+            for record in records:
+                new_spans.append((offset, len(record)))
+                offset += len(record)
+            if new_spans == spans:
+                break
+            spans = new_spans
+
+        temp_path = bundle_path.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(index_bytes)))
+            f.write(index_bytes)
+            for record in records:
+                f.write(record)
+        os.replace(temp_path, bundle_path)
+
+    @staticmethod
+    def is_fresh(bundle_path: Path, world_path: Path, config_path: Path) -> bool:
+        """Check that a bundle exists and is newer than all of its sources."""
+        try:
+            bundle_mtime = bundle_path.stat().st_mtime_ns
+            if config_path.stat().st_mtime_ns > bundle_mtime:
+                return False
+        except OSError:
+            return False
+
+        mtimes = WorldManifest.scan(world_path).get_mtimes()
+        return all(mtime <= bundle_mtime for mtime in mtimes.values())
+
+
+class LazyRoomMap(Mapping):
+    """
+    Read-only room lookup backed by a memory-mapped bundle.
+
+    Rooms are decoded the first time they are requested and then cached, so
+    a session only holds the rooms its player has actually reached. Exits
+    of these rooms are room ID strings, which the movement code resolves
+    through GameWorld.get_room().
+    """
+
+    def __init__(self, bundle: WorldBundle, items: Dict[str, adv.Item], npcs: Dict[str, NPC]):
+        self.bundle = bundle
+        self.items = items
+        self.npcs = npcs
+        self._built: Dict[int, adv.Room] = {}
+
+    def new_view(self) -> 'LazyRoomMap':
+        """Create an independent map over the same bundle with no rooms built."""
+        return LazyRoomMap(self.bundle, self.items, self.npcs)
+
+    def __getitem__(self, room_id: str) -> adv.Room:
+        number = self.bundle.room_numbers[room_id]
+        room = self._built.get(number)
+        if room is None:
+            room = self.bundle.build_room(number, self.items, self.npcs)
+            self._built[number] = room
+        return room
+
+    def __contains__(self, room_id) -> bool:
+        return room_id in self.bundle.room_numbers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.bundle.room_numbers)
+
+    def __len__(self) -> int:
+        return len(self.bundle.room_numbers)
+
+    def get_name(self, room_id: str) -> Optional[str]:
+        """Get a room's display name without building the room."""
+        number = self.bundle.room_numbers.get(room_id)
+        if number is None:
+            return None
+        return self.bundle.index['room_names'][number]
+
+    def built_items(self) -> Dict[str, adv.Room]:
+        """Rooms that have been built so far, keyed by every ID they are stored under."""
+        return {room_id: self._built[number]
+                for room_id, number in self.bundle.index['room_ids']
+                if number in self._built}
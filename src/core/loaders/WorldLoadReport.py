@@ -0,0 +1,48 @@
+from dataclasses import dataclass, field, asdict
+from typing import List, Tuple
+
+
+@dataclass
+class WorldLoadReport:
+    """
+    References that could not be resolved while loading a world.
+
+    Filled in by RoomConnectionManager as it links rooms together, so
+    content problems can be inspected in one place instead of being
+    scattered through the log.
+    """
+    # (room_id) of rooms whose data file could not be found
+    missing_rooms: List[str] = field(default_factory=list)
+    # (room_id, direction, target) of exits pointing at unknown rooms
+    dangling_exits: List[Tuple[str, str, str]] = field(default_factory=list)
+    # (room_id, item_name) of room items that were never created
+    missing_items: List[Tuple[str, str]] = field(default_factory=list)
+    # (room_id, npc_name) of room NPCs that were never created
+    missing_npcs: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def is_clean(self) -> bool:
+        """Check whether every reference was resolved."""
+        return not (self.missing_rooms or self.dangling_exits
+                    or self.missing_items or self.missing_npcs)
+
+    def summary(self) -> str:
+        """Get a one-line count of each kind of unresolved reference."""
+        return (f"{len(self.missing_rooms)} missing rooms, "
+                f"{len(self.dangling_exits)} dangling exits, "
+                f"{len(self.missing_items)} missing items, "
+                f"{len(self.missing_npcs)} missing NPCs")
+
+    def to_dict(self) -> dict:
+        """Convert the report to plain data for storing in a bundle."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'WorldLoadReport':
+        """Recreate a report stored with to_dict()."""
+        return cls(
+            missing_rooms=list(data.get('missing_rooms', [])),
+            dangling_exits=[tuple(entry) for entry in data.get('dangling_exits', [])],
+            missing_items=[tuple(entry) for entry in data.get('missing_items', [])],
+            missing_npcs=[tuple(entry) for entry in data.get('missing_npcs', [])],
+        )
@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Data directories that hold one entity per JSON file
+COMPONENT_KINDS = ('items', 'npcs', 'rooms')
+
+
+class WorldManifest:
+    """
+    Listing of a world's data directory taken in a single os.scandir walk.
+
+    Loaders ask the manifest which level directories and component files
+    exist instead of calling exists(), iterdir() and glob() themselves, so
+    a world load walks its directory tree once. Files keep the order the
+    filesystem lists them in, as glob() would.
+    """
+
+    def __init__(self, world_path: Path):
+        self.world_path = world_path
+        self.level_names: List[str] = []
+
+        # (level or None, kind) -> component files, e.g. (None, 'items')
+        self._components: Dict[Tuple[Optional[str], str], List[Path]] = {}
+        # Every JSON file in the tree -> its directory entry (caches stat)
+        self._entries: Dict[Path, os.DirEntry] = {}
+
+    @classmethod
+    def scan(cls, world_path: Path) -> 'WorldManifest':
+        """Walk a world directory once and record its layout."""
+        manifest = cls(Path(world_path))
+        manifest._walk(str(world_path), ())
+        return manifest
+
+    def _walk(self, directory: str, parts: Tuple[str, ...]) -> None:
+        with os.scandir(directory) as entries:
+            entries = list(entries)
+
+        for entry in entries:
+            if entry.is_dir():
+                if not parts and entry.name.startswith('level_'):
+                    self.level_names.append(entry.name)
+                self._walk(entry.path, parts + (entry.name,))
+            elif entry.name.endswith('.json'):
+                path = Path(entry.path)
+                self._entries[path] = entry
+                component = self.classify_parts(parts + (entry.name,))
+                if component is not None:
+                    self._components.setdefault((component[1], component[0]), []).append(path)
+
+    @staticmethod
+    def classify_parts(parts: Tuple[str, ...]) -> Optional[Tuple[str, Optional[str]]]:
+        """Get the component kind and level of a file from its path parts within a world."""
+        if len(parts) == 2 and parts[0] in COMPONENT_KINDS:
+            return parts[0], None
+        if len(parts) == 3 and parts[0].startswith('level_') and parts[1] in COMPONENT_KINDS:
+            return parts[1], parts[0]
+        return None
+
+    def classify(self, path: Path) -> Optional[Tuple[str, Optional[str]]]:
+        """Get the component kind and level of a file in this world, if it is a component."""
+        return self.classify_parts(Path(path).relative_to(self.world_path).parts)
+
+    def get_level_dirs(self) -> List[Path]:
+        """Get the world's level directories."""
+        return [self.world_path / name for name in self.level_names]
+
+    def get_files(self, kind: str, level: Optional[str] = None) -> List[Path]:
+        """Get the JSON files of one component kind, globally or within a level."""
+        return self._components.get((level, kind), [])
+
+    def has_file(self, path: Path) -> bool:
+        """Check whether a JSON file was present when the world was scanned."""
+        return Path(path) in self._entries
+
+    def get_mtimes(self) -> Dict[Path, int]:
+        """Get the modification time (ns) of every JSON file in the world."""
+        return {path: entry.stat().st_mtime_ns for path, entry in self._entries.items()}
@@ -13,9 +13,14 @@ class BossBattle:
         inventory_names = [item.name.lower() for item in self.game.player.inventory]
         return all(f in inventory_names for f in fragments)
 
+    @property
+    def awaiting_choice(self):
+        """Whether the battle is waiting for the player's choice."""
+        return self.game.command_processor.awaiting_boss_choice
+
     def trigger_battle(self):
-        """Start the boss battle sequence."""
-        if not self.check_fragments():
+        """Start the boss battle sequence; called after each command is processed."""
+        if self.awaiting_choice or not self.game.is_running or not self.check_fragments():
             return
 
         self.game.display.print_message(
@@ -27,22 +32,26 @@ class BossBattle:
 
         self._show_choices()
 
+    def handle_choice(self, choice):
+        """Resolve the battle with the player's choice, asking again if it is invalid."""
+        choice = choice.strip()
+        if choice in self.choices:
+            self.game.command_processor.awaiting_boss_choice = False
+            self.choices[choice]()
+        else:
+            self.game.display.write("\n\nInvalid choice. The fragments pulse warningly...")
+            self._show_choices()
+
     def _show_choices(self):
-        """Display player choices."""
+        """Display player choices; the next command is taken as the choice."""
         self.game.display.print_message(
             "\nWhat do you do? Enter a number\n\n"
             "1. Join Tezzeret and reshape reality\n\n"
             "2. Fight Tezzeret directly\n\n"
             "3. ???"
         )
-
-        choice = input("Enter your choice (1-3): \n").strip()
-
-        if choice in self.choices:
-            self.choices[choice]()
-        else:
-            print("\n\nInvalid choice. The fragments pulse warningly...")
-            self._show_choices()
+        self.game.display.write("Enter your choice (1-3): ")
+        self.game.command_processor.awaiting_boss_choice = True
 
     def _join_tezzeret(self):
         """Handle joining Tezzeret ending."""
@@ -1,35 +1,82 @@
-import adventurelib as adv
+import io
+import re
+import shutil
+import sys
+import textwrap
 import time
 
+class _OutputStream:
+    """File-like writer that hands each write to a callback"""
+    def __init__(self, on_write):
+        self.on_write = on_write
+
+    def write(self, text):
+        self.on_write(text)
+        return len(text)
+
 class DisplayManager:
-    def __init__(self, line_length=60):
+    def __init__(self, line_length=60, output=None):
         self.line_length = line_length
 
+        # Where this game's text goes; None writes to the current sys.stdout
+        self.output = output
+
+    def say(self, msg):
+        """Write a message, de-dented and wrapped exactly like adventurelib's say()"""
+        msg = str(msg)
+        msg = re.sub(r'^[ \t]*(.*?)[ \t]*$', r'\1', msg, flags=re.M)
+        width = shutil.get_terminal_size()[0]
+        paragraphs = re.split(r'\n(?:[ \t]*\n)', msg)
+        formatted = (textwrap.fill(p.strip(), width=width) for p in paragraphs)
+        self.write('\n\n'.join(formatted))
+
+    def write(self, text):
+        """Write text as-is followed by a newline, like print()"""
+        (self.output or sys.stdout).write(f"{text}\n")
+
+    def capture(self):
+        """Collect this game's output in a private buffer instead of stdout"""
+        if not isinstance(self.output, io.StringIO):
+            self.output = io.StringIO()
+
+    def stream(self, on_write):
+        """Pass this game's output to on_write(text) as it is written, until capture() is called"""
+        self.output = _OutputStream(on_write)
+
+    def take_output(self):
+        """Return and clear everything written since the last call (see capture())"""
+        if not isinstance(self.output, io.StringIO):
+            return ""
+        text = self.output.getvalue()
+        self.output.seek(0)
+        self.output.truncate(0)
+        return text
+
     def print_line(self, char="-"):
         """Print a line without extra newlines"""
-        adv.say(char * self.line_length)
+        self.say(char * self.line_length)
 
     def print_section(self, title):
-        adv.say("")  # Add an empty line before the section
+        self.say("")  # Add an empty line before the section
         self.print_line()
-        adv.say(title.center(self.line_length))
+        self.say(title.center(self.line_length))
         self.print_line()
-        adv.say("")  # Add an empty line after the section
+        self.say("")  # Add an empty line after the section
 
     def print_decorated(self, message, char="="):
-        adv.say("")  # Add an empty line before the decorated message
+        self.say("")  # Add an empty line before the decorated message
         self.print_line(char)
         for line in message.split('\n'):
-            adv.say(line.center(self.line_length))
+            self.say(line.center(self.line_length))
         self.print_line(char)
-        adv.say("")  # Add an empty line after the decorated message
+        self.say("")  # Add an empty line after the decorated message
 
     def print_message(self, message):
-        adv.say("")  # Add an empty line before the message
+        self.say("")  # Add an empty line before the message
         self.print_line()
-        adv.say(message)
+        self.say(message)
         self.print_line()
-        adv.say("")  # Add an empty line after the message
+        self.say("")  # Add an empty line after the message
 
     def format_text(self, text):
         """Format text by replacing underscores with spaces and capitalizing appropriately"""
@@ -40,7 +87,7 @@ class DisplayManager:
     def print_list(self, title, items, format_func=None):
         def print_empty_message():
             base_msg = title.lower() if title.lower() in ["items", "exits"] else title
-            adv.say(f"  • There are no {base_msg} here.")
+            self.say(f"  • There are no {base_msg} here.")
         
         def format_item(item):
             if isinstance(item, str):
@@ -53,40 +100,40 @@ class DisplayManager:
             return f"  • {format_func(item) if format_func else self.format_text(str(item))}"
 
         # Always print title with appropriate formatting
-        adv.say("")  # Space before section
+        self.say("")  # Space before section
         if title == "Your inventory":
             self.print_line()
-            adv.say(f"{title}:")
+            self.say(f"{title}:")
             self.print_line()
         elif title == "Available Worlds to Teleport To":
             self.print_line()
-            adv.say(title)
+            self.say(title)
             self.print_line()
         else:
-            adv.say(f"{title}:")  # Just print title with colon
+            self.say(f"{title}:")  # Just print title with colon
         
         # Handle empty lists
         if not items:
             print_empty_message()
-            adv.say("")
+            self.say("")
             return
         
         # Print items
         for item in items:
             formatted_item = format_item(item)
-            adv.say(formatted_item)
+            self.say(formatted_item)
         
         # Add spacing after list if not "Available Worlds"
         if title != "Available Worlds to Teleport To":
-            adv.say("")
+            self.say("")
 
     def print_simple_message(self, message):
-        adv.say("")  # Add an empty line before the simple message
-        adv.say(f"{message}")
-        adv.say("")  # Add an empty line after the simple message
+        self.say("")  # Add an empty line before the simple message
+        self.say(f"{message}")
+        self.say("")  # Add an empty line after the simple message
 
     def print_help_section(self, title):
         """Special method for printing help sections without extra newlines"""
         self.print_line()
-        adv.say(title)
+        self.say(title)
         self.print_line()
\ No newline at end of file
@@ -2,17 +2,25 @@ import json
 import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
-import pickle
 import traceback
 import logging
 from core.systems.ProgressionSystem import ProgressionSystem
+from core.systems.SaveCatalog import SaveCatalog
+from core.systems.SaveFile import SaveFile
+from core.systems.SessionSnapshot import SessionSnapshot
 from typing import Tuple
 
 logger = logging.getLogger(__name__)
 
 class GameState:
+    # Saves shown per page of the save list
+    SAVES_PER_PAGE = 10
+
     def __init__(self, game):
         self.game = game
+        # Whose saves these are; each owner only sees their own saves.
+        # None is the local player, whose saves sit at the top of the directory
+        self.owner: Optional[str] = None
         self.saves_directory = Path("saves")
         self.saves_directory.mkdir(exist_ok=True)
         self.progression = ProgressionSystem(self)
@@ -24,6 +32,10 @@ class GameState:
             'saves_directory': str(self.saves_directory)
         }
     
+    def catalog(self, directory: Optional[Path] = None) -> SaveCatalog:
+        """Get the catalog of the saves directory, or of another directory."""
+        return SaveCatalog.for_directory(directory or self.saves_directory)
+
     def deserialize(self, data):
         """Load game state from serialized data."""
         try:
@@ -34,66 +46,34 @@ class GameState:
             logger.error(f"Error deserializing game state: {str(e)}")
             return False
 
-    def save_game(self, save_name: str) -> bool:
+    def save_game(self, save_name: str, directory: Optional[Path] = None) -> bool:
         """
-        Save game state with custom name.  
-        This now stores the player's current room ID in normalized form
-        so it matches the keys in current_world.rooms exactly.
+        Save game state with custom name.
+        Only what the player has changed from the pristine worlds is
+        stored (see SessionSnapshot), so saves stay small however big the
+        worlds are.
+        Saves go to the saves directory unless another directory is given.
         """
         try:
-            game = self.game
-            saves_dir = self.saves_directory
-            saves_dir.mkdir(exist_ok=True)
+            saves_dir = directory or self.saves_directory
+            saves_dir.mkdir(parents=True, exist_ok=True)
 
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
-            # Find the normalized key for the player's current room
-            current_room_id = None
-            if game.current_world and game.player.current_room:
-                for r_id, r_obj in game.current_world.rooms.items():
-                    if r_obj == game.player.current_room:
-                        current_room_id = r_id
-                        break
+            # Pending prompts belong to the session, not to the save
+            snapshot = SessionSnapshot.capture(self.game)
+            snapshot.pop('awaiting', None)
 
-            # Build save state
             state = {
                 'metadata': {
                     'save_name': save_name,
-                    'timestamp': timestamp,
-                    'version': '1.0'
-                },
-                'player': {
-                    'inventory': [item.name for item in game.player.inventory],
-                    'current_room': current_room_id,  # This is now the normalized ID
-                    'visited_rooms': list(game.player.state.visited_rooms)
+                    'timestamp': timestamp
                 },
-                'world': {
-                    'current_world': game.current_world.name if game.current_world else None,
-                    'room_states': {
-                        room_id: {
-                            'items': [item.name for item in room.items]
-                        }
-                        for room_id, room in game.current_world.rooms.items()
-                    } if game.current_world else {}
-                },
-                'puzzles': {
-                    puzzle_id: {
-                        'completed': puzzle.completed,
-                        'completed_groups': list(getattr(puzzle, '_completed_groups', set()))
-                    }
-                    for puzzle_id, puzzle in game.current_world.puzzles.items()
-                } if game.current_world else {},
-                'progression': {
-                    'world_progress': self.progression.world_progress
-                }
+                'snapshot': snapshot
             }
 
             # Save to file
-            filename = f"{save_name}_{timestamp}.save"
-            save_path = saves_dir / filename
-
-            with open(save_path, 'wb') as f:
-                pickle.dump(state, f)
+            self.catalog(saves_dir).write(self.owner, save_name, timestamp, state)
 
             logger.info(f"Game saved successfully as '{save_name}'")
             return True
@@ -103,33 +83,46 @@ class GameState:
             logger.error(traceback.format_exc())
             return False
 
-    def load_game(self, save_name: str) -> bool:
+    def load_game(self, save_name: str, directory: Optional[Path] = None) -> bool:
         """
-        Load game state from a named save.  
-        Now also normalizes the saved room ID to avoid None-type current_room.
-        If the normalized room is not found, fallback to the world's starting room.
+        Load game state from a named save.
+        The save's changes are applied straight onto fresh copies of the
+        shared world templates; nothing is printed and no world is loaded
+        until the save needs it.
+        Saves from before the delta format are still read: their saved room ID
+        is normalized, falling back to the world's starting room if it is not found.
         """
         try:
             # Find the most recent save file with this name
-            save_files = list(self.saves_directory.glob(f"{save_name}_*.save"))
-            if not save_files:
+            catalog = self.catalog(directory)
+            save = catalog.latest(self.owner, save_name)
+            state = catalog.read(save['filename']) if save else None
+            if state is None:
                 logger.warning(f"No save file found with name '{save_name}'")
                 return False
 
-            # Get most recent save for this name
-            save_path = max(save_files, key=lambda p: p.stat().st_mtime)
-
-            with open(save_path, 'rb') as f:
-                state = pickle.load(f)
-
             # Validate save data
             if not self._validate_save_data(state):
                 logger.warning("Invalid save data structure")
                 return False
 
-            # Reset to initial state
+            # Worlds keep their changes between teleports, so drop them;
+            # each is copied afresh from its template when next used
             game = self.game
-            game.setup()  # This sets up worlds, etc.
+            if game.worlds:
+                game.worlds.unload_all()
+
+            if 'snapshot' in state:
+                SessionSnapshot.apply(game, state['snapshot'])
+                logger.info(f"Game loaded successfully from '{save_name}'")
+                return True
+
+            # Older saves are restored over a new game
+            game.setup(quiet=True)
+            if 'game_state' in state:
+                self._restore_web_save(state)
+                logger.info(f"Game loaded successfully from '{save_name}'")
+                return True
 
             # Restore world
             if state['world']['current_world']:
@@ -178,10 +171,7 @@ class GameState:
                             game.player.current_room = start_rm
                             if start_rm is not None:
                                 # We'll store the new ID to keep the player's state consistent
-                                for r_id, r_obj in game.current_world.rooms.items():
-                                    if r_obj == start_rm:
-                                        game.player.state.current_room_id = r_id
-                                        break
+                                game.player.state.current_room_id = game.current_world.get_room_id(start_rm)
                             game.player.state.current_world_id = game.current_world.name
                             game.player.state.visited_rooms = set(state['player'].get('visited_rooms', []))
                             # Done with fallback
@@ -209,43 +199,63 @@ class GameState:
             logger.error(traceback.format_exc())
             return False
 
-    def list_saves(self) -> list:
-        """List all available save files."""
-        saves = []
-        for save_file in self.saves_directory.glob("*.save"):
-            try:
-                with open(save_file, 'rb') as f:
-                    save_data = pickle.load(f)
-                    saves.append({
-                        'name': save_data['metadata']['save_name'],
-                        'timestamp': save_data['metadata']['timestamp'],
-                        'filename': save_file.name
-                    })
-            except Exception:
-                continue
-
-        # Sort by timestamp, newest first
-        return sorted(saves, key=lambda x: x['timestamp'], reverse=True)
+    def list_saves(self, page: Optional[int] = None, unclaimed: bool = False) -> list:
+        """
+        List the owner's saves, newest first, from the save catalog: all of
+        them, or one page (from 1) of SAVES_PER_PAGE. With unclaimed, list
+        the saves that belong to no one instead.
+        """
+        owner = None if unclaimed else self.owner
+        if page is None:
+            return self.catalog().list(owner)
+        return self.catalog().list(owner, self.SAVES_PER_PAGE, (page - 1) * self.SAVES_PER_PAGE)
+
+    def count_saves(self, unclaimed: bool = False) -> int:
+        """Count the owner's saves, or the unclaimed ones."""
+        return self.catalog().count(None if unclaimed else self.owner)
+
+    def get_save(self, save_number: int, unclaimed: bool = False) -> Optional[Dict[str, str]]:
+        """Get one of the owner's (or the unclaimed) saves by its number in the list, or None."""
+        return self.catalog().get(None if unclaimed else self.owner, save_number)
+
+    def claim_save(self, save_number: int) -> Tuple[bool, str]:
+        """
+        Claim an unclaimed save by its number in their list. Saves from
+        before each player had their own belong to no one; claiming one
+        makes it the owner's and hides it from everyone else.
+        """
+        try:
+            save_to_claim = self.get_save(save_number, unclaimed=True)
+            if save_to_claim is None:
+                return False, "Invalid save number." if self.count_saves(unclaimed=True) else "No saves to claim."
+            if not self.catalog().claim(save_to_claim['filename'], self.owner):
+                return False, "That save has already been claimed."
+            return True, f"Claimed save: {save_to_claim['name']}"
+        except Exception as e:
+            logger.error(f"Error in claim_save: {str(e)}")
+            return False, "Error claiming save."
 
     def _validate_save_data(self, state: Dict) -> bool:
         """Validate save data structure."""
-        required_keys = ['metadata', 'player', 'world', 'puzzles', 'progression']
-        if not all(key in state for key in required_keys):
+        if 'metadata' not in state:
             return False
 
-        # Version check
-        version = state['metadata'].get('version', '0')
-        if version != '1.0':
+        # Saves of the current schema were checked when they were read
+        version = state['metadata'].get('version')
+        if version == SaveFile.SCHEMA_VERSION:
+            return True
+        if version != SaveFile.LEGACY_SCHEMA_VERSION:
             return False
 
-        return True
+        # Legacy full-state saves were written either here or by the web driver
+        required_keys = ['player', 'world', 'puzzles', 'progression']
+        web_keys = ['game_state', 'player_state']
+        return all(key in state for key in required_keys) or all(key in state for key in web_keys)
 
-    def delete_save(self, save_name: str) -> bool:
+    def delete_save(self, save_name: str, directory: Optional[Path] = None) -> bool:
         """Delete a named save file."""
         try:
-            save_files = list(self.saves_directory.glob(f"{save_name}_*.save"))
-            for save_file in save_files:
-                save_file.unlink()
+            self.catalog(directory).delete_name(self.owner, save_name)
             return True
         except Exception as e:
             logger.error(f"Error deleting save '{save_name}': {str(e)}")
@@ -254,21 +264,14 @@ class GameState:
     def delete_game_save(self, save_number: int) -> Tuple[bool, str]:
         """Delete a save game by its number in the list."""
         try:
-            saves = self.list_saves()
-            if not saves:
-                return False, "No saves found."
-
-            if not (1 <= save_number <= len(saves)):
-                return False, "Invalid save number."
-
-            save_to_delete = saves[save_number - 1]
-            save_path = self.saves_directory / save_to_delete['filename']
+            save_to_delete = self.get_save(save_number)
+            if save_to_delete is None:
+                return False, "Invalid save number." if self.count_saves() else "No saves found."
 
             try:
-                save_path.unlink()  # Delete the file
+                if not self.catalog().delete(save_to_delete['filename']):
+                    return False, "Save file not found."
                 return True, f"Deleted save: {save_to_delete['name']}"
-            except FileNotFoundError:
-                return False, "Save file not found."
             except Exception as e:
                 logger.error(f"Error deleting save file: {str(e)}")
                 return False, "Error deleting save file."
@@ -293,4 +296,47 @@ class GameState:
         # Restore progression
         if 'progression' in state:
             self.progression.world_progress = state['progression']['world_progress']
-            # If there's anything else needed for progression, do it here
\ No newline at end of file
+            # If there's anything else needed for progression, do it here
+
+    def _restore_web_save(self, state: Dict[str, Any]) -> None:
+        """Restore a version 1 save written by the web driver onto a freshly set up game."""
+        game = self.game
+        self.progression.world_progress = state['game_state']['world_progress']
+
+        # Set current world
+        world_name = state['game_state']['current_world']
+        if world_name in game.worlds:
+            game.current_world = game.worlds[world_name]
+            game.current_world.initialize(self)
+
+        # Load inventory
+        player_state = state['player_state']
+        game.player.inventory.clear()
+        for item_name in player_state['inventory']:
+            for world_item in game.current_world.items.values():
+                if world_item.name == item_name:
+                    game.player.inventory.add(world_item)
+                    break
+
+        # Load other player state
+        game.player.state.visited_rooms = set(player_state['visited_rooms'])
+        game.player.state.discovered_commands = set(player_state['discovered_commands'])
+        game.player.state.attributes = player_state['attributes']
+
+        # Set current room
+        current_room_id = player_state['current_room_id']
+        if current_room_id and current_room_id in game.current_world.rooms:
+            game.player.current_room = game.current_world.rooms[current_room_id]
+            game.player.state.current_room_id = current_room_id
+            game.player.state.current_world_id = player_state['current_world_id']
+
+        # Load room contents
+        for room_id, room_data in state.get('world_state', {}).get('rooms', {}).items():
+            if room_id in game.current_world.rooms:
+                room = game.current_world.rooms[room_id]
+                room.items.clear()
+                for item_name in room_data['items']:
+                    for world_item in game.current_world.items.values():
+                        if world_item.name == item_name:
+                            room.items.add(world_item)
+                            break
@@ -0,0 +1,231 @@
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.systems.SaveFile import SaveFile
+from core.systems.SqliteConnectionPool import SqliteConnectionPool
+
+logger = logging.getLogger(__name__)
+
+class SaveCatalog:
+    """
+    Index of the save files in a saves directory.
+
+    Each save's owner, name and timestamp are kept in a SQLite file next to
+    the saves, so listing or finding saves reads only the rows asked for
+    instead of opening every save file. Saves belong to an owner (a player
+    or session) and each owner only ever sees their own. An owner's files
+    live in their own directory, spread over 256 shard directories so no
+    one directory grows with the number of players; saves without an owner
+    stay at the top of the saves directory.
+
+    Saves are written to a temporary file and renamed into place before
+    they are indexed, and unindexed before they are deleted, so the catalog
+    never lists a half-written save. A directory with saves but no catalog
+    yet is indexed once, on first use. Filenames in the catalog are
+    relative to the saves directory. Saves from before owners belong to no
+    one; a player can claim them (see claim()).
+    """
+    FILENAME = 'catalog.db'
+    SCHEMA_VERSION = 2
+
+    _catalogs: Dict[Path, 'SaveCatalog'] = {}
+    _catalogs_lock = threading.Lock()
+
+    @classmethod
+    def for_directory(cls, directory: Path) -> 'SaveCatalog':
+        """Get the catalog of a saves directory, shared by everything in this process."""
+        directory = Path(directory).resolve()
+        with cls._catalogs_lock:
+            catalog = cls._catalogs.get(directory)
+            if catalog is None:
+                catalog = cls._catalogs[directory] = cls(directory)
+        return catalog
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._db = SqliteConnectionPool(self.directory / self.FILENAME)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Create or upgrade the catalog, indexing existing saves the first time."""
+        with self._db.transaction() as conn:
+            # Taking the write lock first means only one process does this
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= self.SCHEMA_VERSION:
+                return
+
+            if version == 0:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS saves ("
+                    " filename TEXT PRIMARY KEY,"
+                    " save_name TEXT NOT NULL,"
+                    " timestamp TEXT NOT NULL,"
+                    " owner TEXT NOT NULL DEFAULT '')"
+                )
+                self._index_existing(conn)
+            elif version == 1:
+                # Catalogs from before owners: every save so far is unowned
+                conn.execute("ALTER TABLE saves ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+                conn.execute("DROP INDEX IF EXISTS saves_by_time")
+                conn.execute("DROP INDEX IF EXISTS saves_by_name")
+
+            conn.execute("CREATE INDEX IF NOT EXISTS saves_by_owner ON saves (owner, timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS saves_by_owner_name ON saves (owner, save_name, timestamp)")
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _index_existing(self, conn) -> None:
+        """Index the unowned saves already at the top of the directory."""
+        count = 0
+        for path in self.directory.glob("*.save"):
+            try:
+                metadata = SaveFile.load_metadata(path)
+            except Exception:
+                continue
+            conn.execute(
+                "INSERT OR REPLACE INTO saves (filename, save_name, timestamp) VALUES (?, ?, ?)",
+                (path.name, metadata['save_name'], metadata['timestamp'])
+            )
+            count += 1
+        if count:
+            logger.info(f"Indexed {count} existing saves in {self.directory}")
+
+    @staticmethod
+    def owner_directory(owner: Optional[str]) -> str:
+        """Get the directory, relative to the saves directory, holding an owner's saves."""
+        if not owner:
+            return ''
+        digest = hashlib.sha256(owner.encode()).hexdigest()[:32]
+        return f"{digest[:2]}/{digest}"
+
+    def write(self, owner: Optional[str], save_name: str, timestamp: str, state: Dict[str, Any]) -> str:
+        """Write one of an owner's save files and index it; returns its filename."""
+        # The name is kept in the catalog; the filename only has to be safe and unique
+        safe_name = re.sub(r'[^\w-]', '_', save_name)
+        owner_dir = self.owner_directory(owner)
+        filename = f"{safe_name}_{timestamp}.save"
+        if owner_dir:
+            filename = f"{owner_dir}/{filename}"
+        save_path = self.directory / filename
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=save_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                SaveFile.dump(state, f)
+            os.replace(temp_path, save_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO saves (filename, save_name, timestamp, owner) VALUES (?, ?, ?, ?)",
+                (filename, save_name, timestamp, owner or '')
+            )
+        return filename
+
+    def read(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Read an indexed save file; a save whose file has gone is dropped from the index."""
+        try:
+            return SaveFile.load(self.directory / filename)
+        except FileNotFoundError:
+            logger.warning(f"Save file '{filename}' is missing; removing it from the catalog")
+            self._remove(filename)
+            return None
+
+    def list(self, owner: Optional[str], limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, str]]:
+        """List an owner's saves newest first, as dicts of name, timestamp and filename."""
+        with self._db.connection() as conn:
+            rows = conn.execute(
+                "SELECT save_name, timestamp, filename FROM saves WHERE owner = ? "
+                "ORDER BY timestamp DESC, rowid DESC LIMIT ? OFFSET ?",
+                (owner or '', -1 if limit is None else limit, offset)
+            ).fetchall()
+        return [{'name': name, 'timestamp': timestamp, 'filename': filename}
+                for name, timestamp, filename in rows]
+
+    def get(self, owner: Optional[str], number: int) -> Optional[Dict[str, str]]:
+        """Get the save at a position (from 1) in an owner's list, or None."""
+        if number < 1:
+            return None
+        saves = self.list(owner, limit=1, offset=number - 1)
+        return saves[0] if saves else None
+
+    def latest(self, owner: Optional[str], save_name: str) -> Optional[Dict[str, str]]:
+        """Get an owner's newest save with a name, or None."""
+        with self._db.connection() as conn:
+            row = conn.execute(
+                "SELECT save_name, timestamp, filename FROM saves WHERE owner = ? AND save_name = ? "
+                "ORDER BY timestamp DESC, rowid DESC LIMIT 1",
+                (owner or '', save_name)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'name': row[0], 'timestamp': row[1], 'filename': row[2]}
+
+    def count(self, owner: Optional[str]) -> int:
+        """Count an owner's saves."""
+        with self._db.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM saves WHERE owner = ?", (owner or '',)).fetchone()[0]
+
+    def delete(self, filename: str) -> bool:
+        """Delete a save file; returns False if there was no such save."""
+        if not self._remove(filename):
+            return False
+        (self.directory / filename).unlink(missing_ok=True)
+        return True
+
+    def delete_name(self, owner: Optional[str], save_name: str) -> int:
+        """Delete all of an owner's saves with a name; returns how many were deleted."""
+        with self._db.transaction() as conn:
+            filenames = [row[0] for row in conn.execute(
+                "DELETE FROM saves WHERE owner = ? AND save_name = ? RETURNING filename",
+                (owner or '', save_name)
+            )]
+        for filename in filenames:
+            (self.directory / filename).unlink(missing_ok=True)
+        return len(filenames)
+
+    def claim(self, filename: str, owner: str) -> Optional[str]:
+        """
+        Give an unowned save to an owner, moving its file into their
+        directory; returns its new filename, or None if it is not unowned
+        (any more).
+        """
+        new_filename = f"{self.owner_directory(owner)}/{Path(filename).name}"
+        new_path = self.directory / new_filename
+        new_path.parent.mkdir(parents=True, exist_ok=True)
+        # Link the file into place before re-indexing it, so the catalog
+        # never lists a file that is not there
+        try:
+            os.link(self.directory / filename, new_path)
+        except FileExistsError:
+            # Already being claimed by this owner
+            return None
+        except FileNotFoundError:
+            logger.warning(f"Save file '{filename}' is missing; removing it from the catalog")
+            self._remove(filename)
+            return None
+        with self._db.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE saves SET owner = ?, filename = ? WHERE filename = ? AND owner = ''",
+                (owner, new_filename, filename)
+            )
+        if cursor.rowcount == 0:
+            # Someone else claimed it first
+            new_path.unlink(missing_ok=True)
+            return None
+        (self.directory / filename).unlink(missing_ok=True)
+        return new_filename
+
+    def _remove(self, filename: str) -> bool:
+        with self._db.transaction() as conn:
+            cursor = conn.execute("DELETE FROM saves WHERE filename = ?", (filename,))
+        return cursor.rowcount > 0
@@ -0,0 +1,182 @@
+import json
+import pickle
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+SAVE_MAGIC = b'TZSV'
+FORMAT_VERSION = 1
+
+# magic, container format version, schema version of the save data,
+# size of the JSON metadata that follows
+_HEADER = struct.Struct('<4sHHI')
+
+_NONE = type(None)
+
+# Expected shape of each part of a save at the current schema version:
+# nested dicts of key -> type (or tuple of types)
+METADATA_SCHEMA = {
+    'save_name': str,
+    'timestamp': str,
+}
+BODY_SCHEMA = {
+    'snapshot': {
+        'version': int,
+        'world': (str, _NONE),
+        'room': (str, _NONE),
+        'player': {
+            'inventory': list,
+            'visited_rooms': list,
+            'discovered_commands': list,
+            'attributes': dict,
+        },
+        'worlds': dict,
+        'progression': dict,
+    },
+}
+
+
+class SaveFormatError(ValueError):
+    """A save file that cannot be read: damaged, unknown, or not plain data."""
+
+
+class SaveFile:
+    """
+    Reads and writes save files.
+
+    Layout: a fixed header, the save's metadata as JSON, then the rest of
+    the save as zlib-compressed JSON. The header carries the schema version
+    of the data, so the metadata can be read without touching the body and
+    old saves can be upgraded as they are read (see MIGRATIONS). Both
+    parts are checked against the current schema before writing and after
+    reading; nothing in a save file can run code.
+
+    Saves from before this format were pickles. They are still read, but
+    only as plain data, and report their old schema version (1 for the
+    full-room saves, 2 for the first delta saves).
+
+    Schema 1 is not an older shape of the snapshot but a full copy of the
+    game's state, and turning it into a snapshot needs the world content.
+    Those saves are therefore returned as they are and GameState loads them
+    by its own path; MIGRATIONS only covers schema 2 onwards.
+    """
+    SCHEMA_VERSION = 2
+    LEGACY_SCHEMA_VERSION = 1
+
+    # Functions that upgrade a save's data from one schema version to the
+    # next, keyed by the version they upgrade from (2 or later). Add one
+    # whenever the structure of saves changes, and bump SCHEMA_VERSION.
+    MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+    @classmethod
+    def dump(cls, state: Dict[str, Any], f) -> None:
+        """Write a save (metadata plus body) to a binary file object."""
+        metadata = {key: value for key, value in state['metadata'].items() if key != 'version'}
+        body = {key: value for key, value in state.items() if key != 'metadata'}
+        _check(metadata, METADATA_SCHEMA, 'metadata')
+        _check(body, BODY_SCHEMA, '')
+
+        encoded_metadata = json.dumps(metadata, separators=(',', ':')).encode()
+        f.write(_HEADER.pack(SAVE_MAGIC, FORMAT_VERSION, cls.SCHEMA_VERSION, len(encoded_metadata)))
+        f.write(encoded_metadata)
+        f.write(zlib.compress(json.dumps(body, separators=(',', ':')).encode()))
+
+    @classmethod
+    def load(cls, path: Path) -> Dict[str, Any]:
+        """Read a whole save, upgraded to the newest schema version it can be."""
+        with open(path, 'rb') as f:
+            metadata = cls._read_metadata(f)
+            if metadata is None:
+                state = _load_legacy(f)
+            else:
+                try:
+                    state = dict(json.loads(zlib.decompress(f.read())), metadata=metadata)
+                except (zlib.error, ValueError, TypeError) as e:
+                    raise SaveFormatError(f"Damaged save file {path}: {e}")
+
+        while state['metadata']['version'] in cls.MIGRATIONS:
+            version = state['metadata']['version']
+            state = cls.MIGRATIONS[version](state)
+            state['metadata']['version'] = version + 1
+
+        version = state['metadata']['version']
+        if version == cls.SCHEMA_VERSION:
+            _check(state, BODY_SCHEMA, '')
+        elif version != cls.LEGACY_SCHEMA_VERSION:
+            raise SaveFormatError(f"No migration from save schema {version} to {cls.SCHEMA_VERSION}")
+        return state
+
+    @classmethod
+    def load_metadata(cls, path: Path) -> Dict[str, Any]:
+        """Read just a save's metadata, including the schema version of its data."""
+        with open(path, 'rb') as f:
+            metadata = cls._read_metadata(f)
+            if metadata is None:
+                return _load_legacy(f)['metadata']
+        return metadata
+
+    @classmethod
+    def _read_metadata(cls, f) -> Optional[Dict[str, Any]]:
+        """Read the header and metadata; None (rewound) if this is a legacy save."""
+        header = f.read(_HEADER.size)
+        if not header.startswith(SAVE_MAGIC):
+            f.seek(0)
+            return None
+        if len(header) < _HEADER.size:
+            raise SaveFormatError("Truncated save file")
+
+        _, format_version, schema_version, metadata_size = _HEADER.unpack(header)
+        if format_version != FORMAT_VERSION:
+            raise SaveFormatError(f"Unknown save file format {format_version}")
+        if schema_version > cls.SCHEMA_VERSION:
+            raise SaveFormatError(f"Save was written by a newer version of the game (schema {schema_version})")
+
+        try:
+            metadata = json.loads(f.read(metadata_size))
+        except ValueError as e:
+            raise SaveFormatError(f"Damaged save metadata: {e}")
+        _check(metadata, METADATA_SCHEMA, 'metadata')
+        metadata['version'] = schema_version
+        return metadata
+
+
+class _PlainDataUnpickler(pickle.Unpickler):
+    """Unpickler that refuses anything but built-in data types."""
+
+    def find_class(self, module, name):
+        raise SaveFormatError(f"Legacy save refers to {module}.{name}; only plain data is allowed")
+
+
+def _load_legacy(f) -> Dict[str, Any]:
+    """Read a pickled save from before the current format."""
+    try:
+        state = _PlainDataUnpickler(f).load()
+    except SaveFormatError:
+        raise
+    except Exception as e:
+        raise SaveFormatError(f"Unreadable legacy save: {e}")
+    if not isinstance(state, dict) or not isinstance(state.get('metadata'), dict):
+        raise SaveFormatError("Legacy save has no metadata")
+
+    # Legacy saves recorded their version as '1.0' or '2.0'
+    try:
+        state['metadata']['version'] = int(float(state['metadata'].get('version', 0)))
+    except (TypeError, ValueError):
+        raise SaveFormatError(f"Legacy save has an unknown version: {state['metadata'].get('version')}")
+    _check(state['metadata'], METADATA_SCHEMA, 'metadata')
+    return state
+
+
+def _check(data: Any, schema: Dict[str, Any], path: str) -> None:
+    """Check that data has every key in schema, with values of the expected types."""
+    if not isinstance(data, dict):
+        raise SaveFormatError(f"Expected an object at '{path or '/'}'")
+    for key, expected in schema.items():
+        key_path = f"{path}.{key}" if path else key
+        if key not in data:
+            raise SaveFormatError(f"Save is missing '{key_path}'")
+        if isinstance(expected, dict):
+            _check(data[key], expected, key_path)
+        elif not isinstance(data[key], expected):
+            raise SaveFormatError(f"Save has the wrong type of value at '{key_path}'")
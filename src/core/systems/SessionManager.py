@@ -0,0 +1,216 @@
+import heapq
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class GameSession:
+    """A player's game together with the lock that serializes work on it."""
+
+    def __init__(self, session_id: str, game):
+        self.session_id = session_id
+        self.game = game
+        self.lock = threading.RLock()
+        self.created_at = time.time()
+        self.last_access = self.created_at
+
+        # Version of the session's stored snapshot this game matches, if any
+        self.version: Optional[int] = None
+
+        # Set once the session has been evicted or removed from the registry
+        self.closed = False
+
+    def touch(self) -> None:
+        """Record that the session was just used."""
+        self.last_access = time.time()
+
+
+class _Shard:
+    """One slice of the session registry with its own lock."""
+
+    def __init__(self):
+        self.sessions: Dict[str, GameSession] = {}
+        self.lock = threading.Lock()
+
+
+class SessionManager:
+    """
+    Registry of live game sessions shared by all request threads.
+
+    Sessions are spread over a number of shards by session ID. Looking a
+    session up takes no lock; creating, replacing and removing sessions
+    lock only the shard involved, so threads working on different sessions
+    rarely wait for each other. Work on a session's game must hold that
+    session's own lock (see GameSession.lock), so requests for different
+    sessions run in parallel while two requests for the same session run
+    one after the other.
+
+    Sessions idle for longer than idle_ttl seconds are evicted, and when
+    more than max_sessions are live the least recently used ones are
+    evicted to make room. on_evict(session) may save the game before it is
+    dropped and returns True if it did. get_or_restore() brings back a
+    session this registry does not hold - evicted here, or started by
+    another worker - through on_restore(session_id), which returns the
+    restored game (with its snapshot version) or None.
+    """
+
+    def __init__(self, idle_ttl: Optional[float] = None, max_sessions: Optional[int] = None,
+                 on_evict: Optional[Callable[[GameSession], bool]] = None,
+                 on_restore: Optional[Callable[[str], Optional[Tuple[object, Optional[int]]]]] = None,
+                 sweep_interval: float = 60.0, shards: int = 16):
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.on_evict = on_evict
+        self.on_restore = on_restore
+        self.sweep_interval = sweep_interval
+
+        self._shards: List[_Shard] = [_Shard() for _ in range(shards)]
+        self._next_sweep = time.time() + sweep_interval
+
+        self._count_lock = threading.Lock()
+        self.created_count = 0
+        self.evicted_count = 0
+        self.restored_count = 0
+
+    def _get_shard(self, session_id: str) -> _Shard:
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def get(self, session_id: str) -> Optional[GameSession]:
+        """Look up a session without locking the registry."""
+        self._maybe_sweep()
+        return self._get_shard(session_id).sessions.get(session_id)
+
+    def get_or_restore(self, session_id: str) -> Optional[GameSession]:
+        """Look up a session, restoring it through on_restore if it is not live here."""
+        session = self.get(session_id)
+        if session is not None or self.on_restore is None:
+            return session
+
+        restored = self.on_restore(session_id)
+        if restored is None:
+            return None
+        game, version = restored
+        shard = self._get_shard(session_id)
+        with shard.lock:
+            # Another request may have restored it while we were loading
+            session = shard.sessions.get(session_id)
+            is_new = session is None
+            if is_new:
+                session = GameSession(session_id, game)
+                session.version = version
+                shard.sessions[session_id] = session
+        if is_new:
+            self._count('restored_count')
+            logger.info(f"Restored session {session_id}")
+            self._enforce_budget()
+        return session
+
+    def create(self, session_id: str, game_factory: Callable[[], object]) -> GameSession:
+        """Start a new session, replacing any existing one with the same ID."""
+        # Build the game outside the registry lock; it may take a while
+        session = GameSession(session_id, game_factory())
+        shard = self._get_shard(session_id)
+        with shard.lock:
+            previous = shard.sessions.get(session_id)
+            shard.sessions[session_id] = session
+        if previous is not None:
+            previous.closed = True
+        self._count('created_count')
+        logger.info(f"Created session {session_id}")
+        self._enforce_budget()
+        return session
+
+    def remove(self, session_id: str) -> Optional[GameSession]:
+        """End a session, returning it if it existed."""
+        shard = self._get_shard(session_id)
+        with shard.lock:
+            session = shard.sessions.pop(session_id, None)
+        if session is not None:
+            session.closed = True
+            logger.info(f"Removed session {session_id}")
+        return session
+
+    def sweep(self) -> int:
+        """Evict idle sessions and any over the session budget; returns how many were evicted."""
+        evicted = 0
+        if self.idle_ttl is not None:
+            cutoff = time.time() - self.idle_ttl
+            for session in self._all_sessions():
+                if session.last_access < cutoff and self._evict(session):
+                    evicted += 1
+        return evicted + self._enforce_budget()
+
+    def stats(self) -> Dict[str, int]:
+        """Get session counters."""
+        return {
+            'live': len(self),
+            'created': self.created_count,
+            'evicted': self.evicted_count,
+            'restored': self.restored_count,
+        }
+
+    def _count(self, counter: str) -> None:
+        with self._count_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _all_sessions(self) -> List[GameSession]:
+        sessions = []
+        for shard in self._shards:
+            sessions.extend(list(shard.sessions.values()))
+        return sessions
+
+    def _maybe_sweep(self) -> None:
+        """Sweep for idle sessions at most once per sweep_interval."""
+        now = time.time()
+        if self.idle_ttl is None or now < self._next_sweep:
+            return
+        self._next_sweep = now + self.sweep_interval
+        self.sweep()
+
+    def _enforce_budget(self) -> int:
+        """Evict least recently used sessions while over max_sessions."""
+        if self.max_sessions is None:
+            return 0
+        excess = len(self) - self.max_sessions
+        if excess <= 0:
+            return 0
+        oldest = heapq.nsmallest(excess, self._all_sessions(), key=lambda s: s.last_access)
+        return sum(1 for session in oldest if self._evict(session))
+
+    def _evict(self, session: GameSession) -> bool:
+        """Drop a session, saving it first through on_evict if configured."""
+        # A session busy with a request is in use, not idle; leave it
+        if not session.lock.acquire(blocking=False):
+            return False
+        try:
+            shard = self._get_shard(session.session_id)
+            with shard.lock:
+                if shard.sessions.get(session.session_id) is not session:
+                    return False
+                del shard.sessions[session.session_id]
+            session.closed = True
+
+            saved = False
+            if self.on_evict is not None:
+                try:
+                    saved = bool(self.on_evict(session))
+                except Exception as e:
+                    logger.error(f"Error saving evicted session {session.session_id}: {str(e)}")
+        finally:
+            session.lock.release()
+
+        self._count('evicted_count')
+        logger.info(f"Evicted session {session.session_id}{' (saved)' if saved else ''}")
+        return True
+
+    def session_ids(self) -> List[str]:
+        """Get the IDs of all live sessions."""
+        return [session.session_id for session in self._all_sessions()]
+
+    def __contains__(self, session_id) -> bool:
+        return session_id in self._get_shard(session_id).sessions
+
+    def __len__(self) -> int:
+        return sum(len(shard.sessions) for shard in self._shards)
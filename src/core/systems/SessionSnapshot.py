@@ -0,0 +1,225 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from adventurelib import Bag
+
+from core.world.GameWorld import GameWorld
+from core.world.WorldTemplateCache import world_templates
+
+logger = logging.getLogger(__name__)
+
+# CommandProcessor flags that carry a pending prompt over to the next command
+AWAITING_FLAGS = ('awaiting_save_name', 'awaiting_load_choice', 'awaiting_delete_choice',
+                  'awaiting_claim_choice', 'awaiting_boss_choice')
+
+
+class SessionSnapshot:
+    """
+    Compact, JSON-safe record of what a player has changed in a game.
+
+    Only state that differs from the shared world templates is kept: the
+    player's position, inventory and history, the contents of rooms that
+    no longer match their template, puzzle progress and level progression.
+    Items are referenced as [world name, item key], so a snapshot taken in
+    one process can be applied to a new Game in any other process that has
+    the same world data.
+    """
+    VERSION = 1
+
+    @classmethod
+    def capture(cls, game) -> Dict[str, Any]:
+        """Record a game's state as plain data."""
+        refs = _ItemRefs(game)
+        player = game.player
+        current_world = game.current_world
+
+        worlds = {}
+        for world in _get_loaded_worlds(game):
+            changes = cls._capture_world(world, refs)
+            if changes or world is current_world:
+                worlds[world.name] = changes
+                changes['current_level'] = world.current_level
+
+        room_id = None
+        if current_world is not None and player.current_room is not None:
+            room_id = current_world.get_room_id(player.current_room)
+
+        progression = game.game_state.progression
+        return {
+            'version': cls.VERSION,
+            'world': current_world.name if current_world else None,
+            'room': room_id,
+            'player': {
+                'inventory': refs.get_refs(player.inventory),
+                'current_room_id': player.state.current_room_id,
+                'visited_rooms': sorted(player.state.visited_rooms),
+                'discovered_commands': sorted(player.state.discovered_commands),
+                'attributes': dict(player.state.attributes),
+            },
+            'worlds': worlds,
+            'progression': {name: dict(progress) for name, progress in progression.world_progress.items()},
+            'dev_mode': bool(current_world and current_world.progression and current_world.progression.dev_mode),
+            'awaiting': [flag for flag in AWAITING_FLAGS if getattr(game.command_processor, flag, False)],
+            'is_running': game.is_running,
+        }
+
+    @staticmethod
+    def _capture_world(world: GameWorld, refs: '_ItemRefs') -> Dict[str, Any]:
+        """Record how a session's world differs from its template."""
+        template = world_templates.get_template(world.world_id, GameWorld.build_template)
+        changes: Dict[str, Any] = {}
+
+        rooms = {}
+        seen = set()
+        for room_id, room in world.get_loaded_rooms().items():
+            # The same room may be stored under several IDs
+            if id(room) in seen:
+                continue
+            seen.add(id(room))
+            template_room = template.rooms.get(room_id)
+            if template_room is None or set(room.items) != set(template_room.items):
+                rooms[room_id] = refs.get_refs(room.items)
+        if rooms:
+            changes['rooms'] = rooms
+
+        puzzles = {}
+        for puzzle_id, puzzle in world.puzzles.items():
+            state = {
+                'completed': puzzle.completed,
+                'completed_groups': sorted(getattr(puzzle, '_completed_groups', ())),
+                'current_room': puzzle.current_room,
+            }
+            original = template.puzzles.get(puzzle_id)
+            if (original is None or puzzle.completed != original.completed
+                    or puzzle.current_room != original.current_room
+                    or set(state['completed_groups']) != set(getattr(original, '_completed_groups', ()))):
+                puzzles[puzzle_id] = state
+        if puzzles:
+            changes['puzzles'] = puzzles
+        return changes
+
+    @classmethod
+    def apply(cls, game, data: Dict[str, Any]) -> None:
+        """
+        Put a new, not yet set up Game into the state recorded in a snapshot.
+
+        Worlds are copied from the shared templates and only the recorded
+        changes are applied; nothing is printed.
+        """
+        if data.get('version') != cls.VERSION:
+            raise ValueError(f"Unsupported session snapshot version: {data.get('version')}")
+
+        if not game.worlds:
+            game.load_all_worlds()
+        game_state = game.game_state
+        game_state.progression.world_progress = {
+            name: dict(progress) for name, progress in data.get('progression', {}).items()
+        }
+        game_state.world_progress = game_state.progression.world_progress
+
+        current_name = data.get('world')
+        if current_name not in game.worlds:
+            current_name = 'Intro World' if 'Intro World' in game.worlds else next(iter(game.worlds))
+
+        # Apply the current world last so it is the one attached to the game
+        world_states = data.get('worlds', {})
+        names = [name for name in world_states if name != current_name and name in game.worlds]
+        for name in names + [current_name]:
+            world = game.worlds[name]
+            world.initialize(game_state)
+            cls._apply_world(game, world, world_states.get(name, {}))
+
+        world = game.worlds[current_name]
+        game.current_world = world
+        world.progression.dev_mode = data.get('dev_mode', False)
+
+        player = game.player
+        state = data.get('player', {})
+        player.state.inventory = Bag(cls._resolve_items(game, state.get('inventory', [])))
+        player.state.visited_rooms = set(state.get('visited_rooms', []))
+        player.state.discovered_commands = set(state.get('discovered_commands', []))
+        player.state.attributes = dict(state.get('attributes', {}))
+        player.state.current_world_id = world.name
+
+        room = world.rooms.get(data['room']) if data.get('room') else None
+        if room is None:
+            if data.get('room'):
+                logger.warning(f"Room '{data['room']}' not found. Falling back to starting room.")
+            room = world.get_starting_room()
+        player.current_room = room
+        player.state.current_room_id = state.get('current_room_id') or getattr(room, 'name', None)
+
+        for flag in AWAITING_FLAGS:
+            setattr(game.command_processor, flag, flag in data.get('awaiting', []))
+        game.is_running = data.get('is_running', True)
+
+    @classmethod
+    def _apply_world(cls, game, world: GameWorld, changes: Dict[str, Any]) -> None:
+        """Apply one world's recorded changes to its fresh session copy."""
+        world.current_level = changes.get('current_level', world.current_level)
+
+        for room_id, item_refs in changes.get('rooms', {}).items():
+            room = world.rooms.get(room_id)
+            if room is None:
+                logger.warning(f"Room '{room_id}' no longer exists in world '{world.name}'")
+                continue
+            room.items.clear()
+            room.items.update(cls._resolve_items(game, item_refs))
+
+        for puzzle_id, state in changes.get('puzzles', {}).items():
+            puzzle = world.puzzles.get(puzzle_id)
+            if puzzle is None:
+                continue
+            puzzle.completed = state.get('completed', False)
+            puzzle.current_room = state.get('current_room')
+            if hasattr(puzzle, '_completed_groups'):
+                puzzle._completed_groups = set(state.get('completed_groups', []))
+
+    @staticmethod
+    def _resolve_items(game, item_refs: List[List[str]]) -> list:
+        """Look up the items referenced by [world name, item key] pairs."""
+        items = []
+        for world_name, key in item_refs:
+            item = game.worlds[world_name].items.get(key) if world_name in game.worlds else None
+            if item is None:
+                logger.warning(f"Item '{key}' of world '{world_name}' no longer exists")
+                continue
+            items.append(item)
+        return items
+
+
+def _get_loaded_worlds(game) -> List[GameWorld]:
+    """Get the worlds a game has loaded so far, without loading any others."""
+    return game.worlds.loaded_worlds() if game.worlds else []
+
+
+class _ItemRefs:
+    """Finds the [world name, item key] reference of items in a game's loaded worlds."""
+
+    def __init__(self, game):
+        self.game = game
+        self._refs: Optional[Dict[int, List[str]]] = None
+
+    def get_refs(self, items) -> List[List[str]]:
+        refs = []
+        for item in items:
+            ref = self._get_index().get(id(item))
+            if ref is None:
+                logger.warning(f"Item '{getattr(item, 'name', item)}' is not part of any loaded world")
+                continue
+            refs.append(ref)
+        return sorted(refs)
+
+    def _get_index(self) -> Dict[int, List[str]]:
+        # Built only when the game has items to reference
+        if self._refs is None:
+            self._refs = {}
+            # The current world's keys win when worlds share item objects
+            current_world = self.game.current_world
+            ordered = [current_world] + [w for w in _get_loaded_worlds(self.game) if w is not current_world]
+            for world in ordered:
+                if world is None:
+                    continue
+                for key, item in world.items.items():
+                    self._refs.setdefault(id(item), [world.name, key])
+        return self._refs
@@ -0,0 +1,158 @@
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from core.systems.SqliteConnectionPool import SqliteConnectionPool
+
+logger = logging.getLogger(__name__)
+
+class SessionStore(ABC):
+    """
+    Where session snapshots (see SessionSnapshot) are kept between requests.
+
+    Every save gives the session a new version number, so a worker holding
+    a session in memory can tell whether another worker has played it
+    since. A save only succeeds if the stored version is still the one the
+    worker loaded, so two workers playing the same session cannot silently
+    overwrite each other. Stores marked shared can be read by other
+    processes; only then is it worth checking the version before each
+    command.
+    """
+    shared = False
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Get a session's (version, snapshot), or None if it is not stored."""
+
+    @abstractmethod
+    def version(self, session_id: str) -> Optional[int]:
+        """Get the version of a session's stored snapshot, or None if it is not stored."""
+
+    @abstractmethod
+    def save(self, session_id: str, snapshot: Dict[str, Any], expected_version: Optional[int]) -> Optional[int]:
+        """
+        Store a session's snapshot if its stored version is still
+        expected_version (None for a session not stored yet); returns the
+        new version, or None if another worker saved the session first.
+        """
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Forget a session."""
+
+
+class MemorySessionStore(SessionStore):
+    """Keeps snapshots in this process, remembering at most max_sessions of them."""
+
+    def __init__(self, max_sessions: Optional[int] = 10000):
+        self.max_sessions = max_sessions
+        self._snapshots: "OrderedDict[str, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        return self._snapshots.get(session_id)
+
+    def version(self, session_id: str) -> Optional[int]:
+        entry = self._snapshots.get(session_id)
+        return entry[0] if entry else None
+
+    def save(self, session_id: str, snapshot: Dict[str, Any], expected_version: Optional[int]) -> Optional[int]:
+        with self._lock:
+            entry = self._snapshots.get(session_id)
+            if entry and entry[0] != expected_version:
+                return None
+            self._snapshots.pop(session_id, None)
+            version = entry[0] + 1 if entry else 1
+            self._snapshots[session_id] = (version, snapshot)
+            # Drop the sessions saved longest ago
+            while self.max_sessions is not None and len(self._snapshots) > self.max_sessions:
+                self._snapshots.popitem(last=False)
+        return version
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._snapshots.pop(session_id, None)
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Keeps snapshots as JSON in a SQLite database file.
+
+    Any number of worker processes on the same machine can share the file
+    (see SqliteConnectionPool).
+    """
+    shared = True
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._db = SqliteConnectionPool(self.path)
+
+        with self._db.transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " session_id TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " version INTEGER NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+
+    def load(self, session_id: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        with self._db.connection() as conn:
+            row = conn.execute(
+                "SELECT version, data FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def version(self, session_id: str) -> Optional[int]:
+        with self._db.connection() as conn:
+            row = conn.execute(
+                "SELECT version FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def save(self, session_id: str, snapshot: Dict[str, Any], expected_version: Optional[int]) -> Optional[int]:
+        data = json.dumps(snapshot, separators=(',', ':'))
+        now = time.time()
+        with self._db.transaction() as conn:
+            row = conn.execute(
+                "UPDATE sessions SET data = ?, version = version + 1, updated_at = ? "
+                "WHERE session_id = ? AND version IS ? RETURNING version",
+                (data, now, session_id, expected_version)
+            ).fetchone()
+            if row is None:
+                # Not stored (yet, or any more), unless another worker has saved it
+                row = conn.execute(
+                    "INSERT INTO sessions (session_id, data, version, updated_at) VALUES (?, ?, 1, ?) "
+                    "ON CONFLICT (session_id) DO NOTHING RETURNING version",
+                    (session_id, data, now)
+                ).fetchone()
+        return row[0] if row else None
+
+    def delete(self, session_id: str) -> None:
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def purge(self, max_age: float) -> int:
+        """Delete sessions not saved for max_age seconds; returns how many were deleted."""
+        with self._db.transaction() as conn:
+            cursor = conn.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - max_age,))
+        return cursor.rowcount
+
+
+def create_session_store(url: str) -> SessionStore:
+    """
+    Create a session store from a URL: "memory" keeps sessions in this
+    process, "sqlite:///path/to/sessions.db" shares them through a file.
+    """
+    if url == 'memory':
+        return MemorySessionStore()
+    if url.startswith('sqlite:///'):
+        return SqliteSessionStore(Path(url[len('sqlite:///'):]))
+    raise ValueError(f"Unknown session store: {url}")
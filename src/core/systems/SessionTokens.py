@@ -0,0 +1,65 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+class SessionTokens:
+    """
+    Issues and checks the opaque tokens that identify game sessions.
+
+    A token is a random session ID followed by an HMAC of it, so it cannot
+    be guessed or forged and is checked without looking anything up. The
+    signature is compared in constant time. Every process that serves the
+    same players needs the same secret; forked workers inherit it. Tokens
+    signed with a random secret die with the process, so servers that keep
+    sessions or saves across restarts should use with_secret_file().
+    """
+    # Random bytes in a session ID, and bytes of signature kept
+    ID_BYTES = 18
+    SIGNATURE_BYTES = 16
+
+    def __init__(self, secret: Optional[bytes] = None):
+        self.secret = secret or secrets.token_bytes(32)
+
+    @classmethod
+    def with_secret_file(cls, path: Path) -> 'SessionTokens':
+        """Use the secret kept in a file, generating it (readable only by its owner) the first time."""
+        path = Path(path)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(secrets.token_hex(32))
+                try:
+                    # Whichever process links its file first wins; the rest read it
+                    os.link(temp_path, path)
+                except FileExistsError:
+                    pass
+            finally:
+                os.unlink(temp_path)
+        return cls(path.read_text().strip().encode())
+
+    def issue(self) -> str:
+        """Create a token for a new session."""
+        session_id = secrets.token_urlsafe(self.ID_BYTES)
+        return f"{session_id}.{self._sign(session_id)}"
+
+    def validate(self, token) -> Optional[str]:
+        """Get the session ID of a genuine token, or None."""
+        if not isinstance(token, str):
+            return None
+        session_id, _, signature = token.partition('.')
+        if not session_id or not signature:
+            return None
+        if not hmac.compare_digest(signature.encode(), self._sign(session_id).encode()):
+            return None
+        return session_id
+
+    def _sign(self, session_id: str) -> str:
+        digest = hmac.new(self.secret, session_id.encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest[:self.SIGNATURE_BYTES]).rstrip(b'=').decode()
@@ -0,0 +1,51 @@
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class SqliteConnectionPool:
+    """
+    Reusable connections to one SQLite database file.
+
+    A connection is handed to one thread at a time and returned to the pool
+    afterwards, so request threads do not open a new connection each time.
+    After a fork the child starts an empty pool instead of sharing its
+    parent's connections. Databases are switched to WAL mode so readers do
+    not wait for writers, including those in other processes.
+    """
+
+    def __init__(self, path: Path, timeout: float = 30):
+        self.path = Path(path)
+        self.timeout = timeout
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool: "queue.SimpleQueue[sqlite3.Connection]" = queue.SimpleQueue()
+        self._pid = os.getpid()
+
+        with self.connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of a with block."""
+        if self._pid != os.getpid():
+            # Forked since the pool was filled; the parent's connections stay with it
+            self._pool = queue.SimpleQueue()
+            self._pid = os.getpid()
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(str(self.path), timeout=self.timeout, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection and commit (or roll back) what is done with it."""
+        with self.connection() as conn, conn:
+            yield conn
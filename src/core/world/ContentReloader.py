@@ -0,0 +1,245 @@
+import logging
+import threading
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from adventurelib import Room
+
+from core.world.GameWorld import GameWorld
+from core.world.WorldTemplateCache import world_templates
+from core.loaders.GameDataParser import GameDataParser
+from core.loaders.GameEntityFactory import GameEntityFactory
+from core.loaders.RoomConnectionManager import RoomConnectionManager
+from core.loaders.WorldBundle import LazyRoomMap
+from core.loaders.WorldManifest import WorldManifest
+
+logger = logging.getLogger('world')
+
+class ContentReloader:
+    """
+    Picks up edits to world JSON files while the server keeps running.
+
+    The data directory of every built world template is polled for changed
+    modification times. Only the files that changed are parsed again; items
+    and NPCs are updated in place (sessions share them with the template),
+    and an edited room is refreshed in the template and in every live
+    session's copy of the world, keeping what players have already changed.
+    A session's copy is only changed by its own session: the change is
+    queued on the copy and applied before the session's next command (see
+    Game.apply_content_updates).
+
+    Templates loaded from compiled bundles are not patched, so run with
+    GameWorld.use_bundles turned off while editing content. New files are
+    added; deleting a file needs a restart to take effect.
+    """
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.json_loader = GameDataParser()
+
+        # World ID -> {data file: modification time} at the last check
+        self._mtimes: Dict[str, Dict[Path, int]] = {}
+        # Item or NPC file -> key its entity is stored under
+        self._keys: Dict[Path, str] = {}
+        self._skipped = set()
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Record the current state of the data files and poll them in the background."""
+        if self._thread is not None:
+            return
+        self.check()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='content-reloader', daemon=True)
+        self._thread.start()
+        logger.info(f"Watching world data for changes every {self.interval}s")
+
+    def stop(self) -> None:
+        """Stop polling."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.error(f"Error reloading world content:\n{traceback.format_exc()}")
+
+    def check(self) -> List[Path]:
+        """Apply every data file changed since the last check; returns the files reloaded."""
+        reloaded = []
+        for world_id, template in world_templates.get_templates().items():
+            if isinstance(template.rooms, LazyRoomMap):
+                if world_id not in self._skipped:
+                    logger.warning(f"World '{world_id}' was loaded from a bundle; its content will not be reloaded")
+                    self._skipped.add(world_id)
+                continue
+
+            manifest = WorldManifest.scan(GameWorld._get_world_path(world_id))
+            mtimes = manifest.get_mtimes()
+            previous = self._mtimes.get(world_id)
+            self._mtimes[world_id] = mtimes
+
+            if previous is None:
+                # First time this world is seen: remember what it was built from
+                self._record_keys(manifest)
+                continue
+
+            for path, mtime in mtimes.items():
+                if previous.get(path) != mtime and self._reload_file(world_id, template, manifest, path):
+                    reloaded.append(path)
+            for path in previous.keys() - mtimes.keys():
+                logger.warning(f"Data file {path} was removed; restart the server to drop its content")
+        return reloaded
+
+    def _record_keys(self, manifest: WorldManifest) -> None:
+        """Remember which key each item and NPC file is stored under."""
+        for path in manifest.get_mtimes():
+            kind = manifest.classify(path)
+            if kind is None or kind[0] == 'rooms':
+                continue
+            try:
+                data = self.json_loader.load_json_file(path)
+                self._keys[path] = self._get_key(kind[0], data, kind[1])
+            except (ValueError, KeyError, OSError) as e:
+                logger.warning(f"Could not read {path}: {str(e)}")
+
+    def _get_key(self, kind: str, data: dict, level: Optional[str]) -> str:
+        if kind == 'npcs':
+            return GameEntityFactory(None).get_npc_key(data, level)
+        return self.json_loader.construct_key(data['name'], level)
+
+    def _reload_file(self, world_id: str, template: GameWorld, manifest: WorldManifest, path: Path) -> bool:
+        """Parse one changed data file and patch it into the world."""
+        kind = manifest.classify(path)
+        if kind is None:
+            logger.warning(f"Changed file {path} is not reloadable; restart the server to apply it")
+            return False
+
+        kind, level = kind
+        try:
+            data = self.json_loader.load_json_file(path)
+            if kind == 'items':
+                self._reload_item(template, path, data, level)
+            elif kind == 'npcs':
+                self._reload_npc(template, path, data, level)
+            else:
+                self._reload_room(world_id, template, path, data, level)
+        except Exception as e:
+            # Usually a file saved halfway through an edit; the next save retries
+            logger.error(f"Could not reload {path}: {str(e)}")
+            return False
+
+        logger.info(f"Reloaded {kind[:-1]} from {path}")
+        return True
+
+    def _reload_item(self, template: GameWorld, path: Path, data: dict, level: Optional[str]) -> None:
+        item = GameEntityFactory(template).build_item(data)
+        key = self._get_key('items', data, level)
+        old_key = self._keys.get(path, key)
+
+        # Items are shared by every session, so updating one in place
+        # also updates it in rooms, NPC inventories and player inventories
+        existing = template.items.pop(old_key, None)
+        template.item_names.pop(old_key, None)
+        if existing is not None:
+            existing.__dict__.clear()
+            existing.__dict__.update(item.__dict__)
+            item = existing
+
+        template.items[key] = item
+        template.item_names[key] = item.name
+        self._keys[path] = key
+
+    def _reload_npc(self, template: GameWorld, path: Path, data: dict, level: Optional[str]) -> None:
+        npc = GameEntityFactory(template).build_npc(data, level)
+        key = self._get_key('npcs', data, level)
+        old_key = self._keys.get(path, key)
+
+        existing = template.npcs.pop(old_key, None)
+        if existing is not None:
+            existing.__dict__.clear()
+            existing.__dict__.update(npc.__dict__)
+            npc = existing
+
+        template.npcs[key] = npc
+        self._keys[path] = key
+
+    def _reload_room(self, world_id: str, template: GameWorld, path: Path, data: dict, level: Optional[str]) -> None:
+        factory = GameEntityFactory(template)
+        room_ids = factory.get_room_ids(path, data['name'], level)
+        file_id = room_ids[0]
+
+        room = template.rooms.get(file_id)
+        is_new = room is None
+        if is_new:
+            room = factory.build_room(data)
+            room.id = file_id
+            old_items, old_npcs = set(), []
+        else:
+            room.description = data['description'].strip()
+            room.name = data['name']
+            old_items, old_npcs = set(room.items), list(room.npcs)
+
+        self._store_room(template.rooms, room, room_ids)
+        affected = RoomConnectionManager(template).refresh_room(room, data, file_id)
+
+        changes = {
+            'added_items': set(room.items) - old_items,
+            'removed_items': old_items - set(room.items),
+            'added_npcs': [npc for npc in room.npcs if npc not in old_npcs],
+            'removed_npcs': [npc for npc in old_npcs if npc not in room.npcs],
+        }
+
+        # Sessions may be in the middle of a command; each applies the change before its next one
+        for world in world_templates.get_instances(world_id):
+            world.queue_update(
+                lambda world: self._update_session_room(world, room, room_ids, affected, **changes)
+            )
+
+        if is_new:
+            logger.info(f"Added room {file_id} to world '{world_id}'")
+
+    @staticmethod
+    def _store_room(rooms: Dict[str, Room], room: Room, room_ids: tuple) -> None:
+        """Store a room under its file ID and name-based ID, dropping IDs left from an old name."""
+        for room_id in [room_id for room_id, stored in rooms.items() if stored is room and room_id not in room_ids]:
+            del rooms[room_id]
+        for room_id in room_ids:
+            rooms[room_id] = room
+
+    def _update_session_room(self, world: GameWorld, room: Room, room_ids: tuple, affected: list,
+                             added_items: set, removed_items: set, added_npcs: list, removed_npcs: list) -> None:
+        """Bring a session's copy of a reloaded room up to date."""
+        room_copy = world.rooms.get(room_ids[0])
+        if room_copy is None:
+            room_copy = GameWorld.copy_room(room)
+        else:
+            # Keep what the player has already picked up or moved
+            for attr, value in room.__dict__.items():
+                if attr not in ('items', 'npcs') and attr not in Room._directions:
+                    room_copy.__dict__[attr] = value
+            for stairs in ('stairs_up', 'stairs_down'):
+                if stairs not in room.__dict__:
+                    room_copy.__dict__.pop(stairs, None)
+            room_copy.items.difference_update(removed_items)
+            room_copy.items.update(added_items)
+            room_copy.npcs[:] = [npc for npc in room_copy.npcs if npc not in removed_npcs] + added_npcs
+        self._store_room(world.rooms, room_copy, room_ids)
+
+        # Point the affected rooms' exits at this session's own rooms
+        for template_room in affected:
+            linked_copy = world.rooms.get(template_room.id)
+            if linked_copy is None:
+                continue
+            for direction in Room._directions:
+                target = template_room.__dict__.get(direction)
+                if isinstance(target, Room):
+                    object.__setattr__(linked_copy, direction, world.rooms.get(target.id))
+                else:
+                    linked_copy.__dict__.pop(direction, None)
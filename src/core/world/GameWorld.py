@@ -2,9 +2,10 @@
 
 import json
 import logging
+from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Optional, List, Any, Set
+from typing import Callable, Deque, Dict, Optional, List, Any, Set
 
 # Core game components
 from adventurelib import Room, Item, Bag
@@ -18,12 +19,15 @@ from puzzles.core.BasePuzzle import BasePuzzle
 
 # World component management
 from core.world.WorldComponentLoader import WorldComponentLoader
+from core.world.WorldTemplateCache import world_templates
 from core.loaders.RoomConnectionManager import RoomConnectionManager
 from puzzles.core.PuzzleManager import PuzzleManager
 
 # Data handling
 from core.loaders.GameDataParser import GameDataParser
 from core.loaders.GameEntityFactory import GameEntityFactory
+from core.loaders.WorldBundle import WorldBundle, LazyRoomMap
+from core.loaders.WorldLoadReport import WorldLoadReport
 
 # Progression system
 from core.systems.ProgressionSystem import ProgressionSystem
@@ -43,6 +47,13 @@ class GameWorld:
     Manages a complete game world, including loading, state management,
     and component coordination.
     """
+    # Build rooms from a compiled bundle only when a session first needs them
+    lazy_rooms: bool = True
+
+    # Load templates from compiled bundles when they are up to date; turned
+    # off when editing content so templates can be patched from the JSON
+    use_bundles: bool = True
+
     def __init__(self, world_id: str):
         self.world_id = world_id
         self.name: str = ""
@@ -54,6 +65,7 @@ class GameWorld:
         self.npcs: Dict[str, NPC] = {}
         self.puzzles: Dict[str, BasePuzzle] = {}
         self.item_names: Dict[str, str] = {}  # For looking up original names
+        self.load_report = WorldLoadReport()  # Unresolved references found while loading
         
         # Component managers
         self.component_loader = WorldComponentLoader(self)
@@ -69,14 +81,45 @@ class GameWorld:
         self.game_state = None
         self.progression = None
         self.current_level = "level_one"  # Default level
+        self.is_loaded = False
+
+        # Content edits waiting to reach this session's copy (see ContentReloader)
+        self._pending_updates: Deque[Callable[['GameWorld'], None]] = deque()
 
-    # Then in GameWorld.py, modify initialize():
     def initialize(self, game_state):
-        """Initialize the world with game state."""
+        """
+        Make the world ready for play in a game session.
+
+        The world's contents are loaded only the first time; afterwards this
+        just (re)attaches the session, so rooms, items and puzzles keep any
+        changes the player has made.
+        """
+        if not self.is_loaded:
+            self.load_world()
+        self.attach(game_state)
+
+    def attach(self, game_state):
+        """Bind this (already loaded) world to a game session."""
         self.game_state = game_state
         self.game = game_state.game  # Make sure game reference is set
         self.progression = ProgressionSystem(game_state)
-        self.load_world()
+
+        # Template puzzles have no game attached; bind this session's copies
+        for puzzle in self.puzzles.values():
+            puzzle.game = self.game
+
+    def queue_update(self, update: Callable[['GameWorld'], None]) -> None:
+        """Queue a change to apply to this world before its session's next command."""
+        self._pending_updates.append(update)
+
+    def apply_updates(self) -> None:
+        """Apply the queued changes; only call this while holding the session's lock."""
+        while True:
+            try:
+                update = self._pending_updates.popleft()
+            except IndexError:
+                return
+            update(self)
 
     def serialize(self):
         return {
@@ -127,7 +170,90 @@ class GameWorld:
         }
 
     def load_world(self) -> None:
-        """Load and initialize the complete world"""
+        """Load the world from the shared template, building it on first use"""
+        template = world_templates.get_template(self.world_id, GameWorld.build_template)
+        self._copy_from_template(template)
+        self.is_loaded = True
+
+        # Let content reloads reach this session's copy
+        world_templates.track_instance(self.world_id, self)
+
+    @classmethod
+    def build_template(cls, world_id: str) -> 'GameWorld':
+        """Create a fully loaded world to be shared as a read-only template"""
+        template = cls(world_id)
+        if not cls.use_bundles or not template.load_from_bundle():
+            template.load_from_source()
+        return template
+
+    def load_from_bundle(self) -> bool:
+        """Load the world from its compiled bundle if it is newer than the JSON sources"""
+        world_path = self._get_world_path(self.world_id)
+        bundle_path = WorldBundle.get_bundle_path(world_path)
+        if not WorldBundle.is_fresh(bundle_path, world_path, self._get_config_path()):
+            return False
+
+        bundle = WorldBundle.open(bundle_path)
+        if bundle is None:
+            return False
+
+        self.config = GameWorldConfig(**bundle.index['config'])
+        self.name = self.config.name
+        bundle.apply(self, lazy=GameWorld.lazy_rooms)
+
+        # Puzzles are Python classes rather than data, so create them as usual
+        self.component_loader = WorldComponentLoader(self)
+        self.component_loader._load_built_in_puzzles()
+        self.is_loaded = True
+        self.logger.info(f"Loaded world from bundle: {bundle_path}")
+        return True
+
+    def _copy_from_template(self, template: 'GameWorld') -> None:
+        """Populate this world with session-local copies of a template's state"""
+        self.name = template.name
+        self.config = template.config
+        self.current_level = template.current_level
+
+        # Items and NPCs are never modified during play, so they are shared
+        self.items = template.items
+        self.item_names = template.item_names
+        self.npcs = template.npcs
+        self.load_report = template.load_report
+
+        self.puzzles = {puzzle_id: puzzle.clone() for puzzle_id, puzzle in template.puzzles.items()}
+
+        # Rooms backed by a mapped bundle are built per session on demand
+        if isinstance(template.rooms, LazyRoomMap):
+            self.rooms = template.rooms.new_view()
+            return
+
+        # Rooms hold per-session contents; the same room may be stored
+        # under several IDs, so copy each room object only once
+        room_copies = {}
+        for room in template.rooms.values():
+            if id(room) not in room_copies:
+                room_copies[id(room)] = self.copy_room(room)
+
+        # Point exits at the copied rooms instead of the template's
+        for room_copy in room_copies.values():
+            for direction in Room._directions:
+                target = room_copy.__dict__.get(direction)
+                if isinstance(target, Room) and id(target) in room_copies:
+                    object.__setattr__(room_copy, direction, room_copies[id(target)])
+
+        self.rooms = {room_id: room_copies[id(room)] for room_id, room in template.rooms.items()}
+
+    @staticmethod
+    def copy_room(room: Room) -> Room:
+        """Copy a room with its own contents; exits still point at the original's targets"""
+        room_copy = Room.__new__(Room)
+        room_copy.__dict__.update(room.__dict__)
+        room_copy.items = Bag(room.items)
+        room_copy.npcs = list(getattr(room, 'npcs', []))
+        return room_copy
+
+    def load_from_source(self) -> None:
+        """Load and initialize the complete world from its data files"""
         try:
             # Load world configuration
             self._load_world_config()
@@ -143,6 +269,7 @@ class GameWorld:
             
             # Verify room connections
             self._verify_room_connections()
+            self.is_loaded = True
             
         except Exception as e:
             self.logger.error(f"Failed to load world: {str(e)}")
@@ -170,6 +297,29 @@ class GameWorld:
         normalized_id = self._normalize_room_id(room_id)
         return self.rooms.get(normalized_id)
 
+    def get_room_id(self, room) -> Optional[str]:
+        """Get the ID a room object is stored under"""
+        room_id = getattr(room, 'id', None)
+        if room_id is not None:
+            return room_id
+        for r_id, r_obj in self.get_loaded_rooms().items():
+            if r_obj == room:
+                return r_id
+        return None
+
+    def get_room_name(self, room_id: str) -> Optional[str]:
+        """Get a room's display name from its ID without loading the room"""
+        if isinstance(self.rooms, LazyRoomMap):
+            return self.rooms.get_name(room_id)
+        room = self.rooms.get(room_id)
+        return room.name if room else None
+
+    def get_loaded_rooms(self) -> Dict[str, Room]:
+        """Get the rooms that currently exist in memory, keyed by room ID"""
+        if isinstance(self.rooms, LazyRoomMap):
+            return self.rooms.built_items()
+        return self.rooms
+
     def get_starting_room(self) -> Optional[Room]:
         """Get the world's starting room"""
         if not self.config or not self.config.starting_room:
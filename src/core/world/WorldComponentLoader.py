@@ -6,6 +6,7 @@ import traceback
 from core.loaders.GameDataParser import GameDataParser
 from core.loaders.GameEntityFactory import GameEntityFactory
 from core.loaders.RoomConnectionManager import RoomConnectionManager
+from core.loaders.WorldManifest import WorldManifest
 from puzzles.types.AirLevelPuzzle import AirLevelPuzzle
 from puzzles.types.EarthLevelPuzzle import EarthLevelPuzzle
 from puzzles.types.WaterLevelPuzzle import WaterLevelPuzzle
@@ -30,11 +31,14 @@ class WorldComponentLoader:
     def load_components(self, world_path: Path) -> None:
         """Load all world components."""
         try:
+            # List the world directory once for every loading stage
+            manifest = WorldManifest.scan(world_path)
+
             # First load all standard components
-            self._load_standard_components(world_path)
+            self._load_standard_components(manifest)
             
             # Then set up room connections
-            self.connector.setup_room_connections(world_path)
+            self.connector.setup_room_connections(world_path, manifest)
             
             # Finally load built-in puzzles
             self._load_built_in_puzzles()
@@ -43,62 +47,47 @@ class WorldComponentLoader:
             logger.error(f"Error loading components: {str(e)}")
             raise
 
-    def _load_standard_components(self, world_path: Path) -> None:
+    def _load_standard_components(self, manifest: WorldManifest) -> None:
         """Load all JSON-based components."""
         try:
             # Load global components first
-            self._load_global_components(world_path)
+            self._load_global_components(manifest)
 
             # Then load level-specific components
-            level_dirs = self.json_loader.get_level_dirs(world_path)
-            for level_dir in level_dirs:
-                self._load_level_components(level_dir)
+            for level in manifest.level_names:
+                self._load_level_components(manifest, level)
                 
         except Exception as e:
             logger.error(f"Error loading standard components: {e}")
             raise
 
-    def _load_global_components(self, world_path: Path) -> None:
+    def _load_global_components(self, manifest: WorldManifest) -> None:
         """Load components from the world's root directory."""
         # Load global items
-        items_path = world_path / 'items'
-        if items_path.exists():
-            for item_file in items_path.glob('*.json'):
-                self.creator.create_item(item_file)
+        for item_file in manifest.get_files('items'):
+            self.creator.create_item(item_file)
         
         # Load global NPCs
-        npcs_path = world_path / 'npcs'
-        if npcs_path.exists():
-            for npc_file in npcs_path.glob('*.json'):
-                self.creator.create_npc(npc_file)
+        for npc_file in manifest.get_files('npcs'):
+            self.creator.create_npc(npc_file)
         
         # Load global rooms
-        rooms_path = world_path / 'rooms'
-        if rooms_path.exists():
-            for room_file in rooms_path.glob('*.json'):
-                self.creator.create_room(room_file)
+        for room_file in manifest.get_files('rooms'):
+            self.creator.create_room(room_file)
 
-    def _load_level_components(self, level_dir: Path) -> None:
+    def _load_level_components(self, manifest: WorldManifest, level: str) -> None:
         """Load components from a specific level directory."""
-        level = level_dir.name
-        
         # Load level items
-        items_path = level_dir / 'items'
-        if items_path.exists():
-            for item_file in items_path.glob('*.json'):
-                self.creator.create_item(item_file, level=level)
+        for item_file in manifest.get_files('items', level):
+            self.creator.create_item(item_file, level=level)
         
         # Load level NPCs
-        npcs_path = level_dir / 'npcs'
-        if npcs_path.exists():
-            for npc_file in npcs_path.glob('*.json'):
-                self.creator.create_npc(npc_file, level=level)
+        for npc_file in manifest.get_files('npcs', level):
+            self.creator.create_npc(npc_file, level=level)
         
         # Load level rooms
-        rooms_path = level_dir / 'rooms'
-        if rooms_path.exists():
-            for room_file in rooms_path.glob('*.json'):
-                self.creator.create_room(room_file, level=level)
+        for room_file in manifest.get_files('rooms', level):
+            self.creator.create_room(room_file, level=level)
 
     def _load_built_in_puzzles(self) -> None:
         """Initialize and load built-in Python puzzles based on world type."""
@@ -0,0 +1,61 @@
+import logging
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterator, List
+
+from core.world.GameWorld import GameWorld
+
+logger = logging.getLogger('world')
+
+class WorldRegistry(Mapping):
+    """
+    A game's worlds, keyed by the names in worlds.json.
+
+    The set of worlds comes from the configuration alone; a GameWorld is
+    only created and loaded the first time it is looked up, so a session
+    never pays for worlds its player does not visit. Iterating over the registry (or its keys) never loads a world.
+    """
+    def __init__(self, worlds_data: dict):
+        # World name -> worlds.json key (world ID)
+        self._world_ids: Dict[str, str] = {
+            info.get('name', world_id): world_id for world_id, info in worlds_data.items()
+        }
+        self._loaded: Dict[str, GameWorld] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> GameWorld:
+        world = self._loaded.get(name)
+        if world is not None:
+            return world
+
+        world_id = self._world_ids[name]
+        with self._lock:
+            world = self._loaded.get(name)
+            if world is None:
+                try:
+                    world = GameWorld(world_id)
+                    world.load_world()
+                except Exception as e:
+                    logger.error(f"Error loading world '{world_id}': {str(e)}")
+                    raise KeyError(name) from e
+                self._loaded[name] = world
+                logger.info(f"Successfully loaded world: {world.name}")
+            return world
+
+    def __contains__(self, name) -> bool:
+        return name in self._world_ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._world_ids)
+
+    def __len__(self) -> int:
+        return len(self._world_ids)
+
+    def loaded_worlds(self) -> List[GameWorld]:
+        """Get the worlds loaded so far."""
+        return list(self._loaded.values())
+
+    def unload_all(self) -> None:
+        """Forget all loaded worlds so the next lookup starts from a fresh copy."""
+        with self._lock:
+            self._loaded.clear()
@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+import weakref
+from typing import Callable, Dict, List, Optional, Any
+
+logger = logging.getLogger('world')
+
+class WorldTemplateCache:
+    """
+    Process-wide store of fully loaded worlds used as read-only templates.
+
+    Each template is built once (from disk) the first time it is requested.
+    Sessions never play on a template directly; they receive cheap copies
+    made by GameWorld so that loading a world for a new player does not
+    touch the filesystem again.
+    """
+    def __init__(self):
+        self._templates: Dict[str, Any] = {}
+        self._worlds_data: Optional[dict] = None
+        self._lock = threading.Lock()
+
+        # One lock per world so different worlds can be built concurrently
+        self._build_locks: Dict[str, threading.Lock] = {}
+
+        # How long each template took to build, in milliseconds
+        self.build_times: Dict[str, float] = {}
+
+        # Session copies of each template that are still alive
+        self._instances: Dict[str, weakref.WeakSet] = {}
+
+    def get_template(self, world_id: str, build: Callable[[str], Any]):
+        """Return the template for a world, building it on first use."""
+        template = self._templates.get(world_id)
+        if template is not None:
+            return template
+
+        with self._lock:
+            build_lock = self._build_locks.setdefault(world_id, threading.Lock())
+
+        with build_lock:
+            # Another thread may have finished the build while we waited
+            template = self._templates.get(world_id)
+            if template is None:
+                start = time.perf_counter()
+                template = build(world_id)
+                elapsed = (time.perf_counter() - start) * 1000
+                self._templates[world_id] = template
+                self.build_times[world_id] = elapsed
+                logger.info(f"Built world template: {world_id} ({elapsed:.1f} ms)")
+            return template
+
+    def get_worlds_data(self, load: Callable[[], dict]) -> dict:
+        """Return the parsed worlds.json contents, loading it on first use."""
+        if self._worlds_data is None:
+            with self._lock:
+                if self._worlds_data is None:
+                    self._worlds_data = load()
+        return self._worlds_data
+
+    def get_templates(self) -> Dict[str, Any]:
+        """Get all templates built so far, keyed by world ID."""
+        return dict(self._templates)
+
+    def track_instance(self, world_id: str, world) -> None:
+        """Remember a session's copy of a template until it is garbage collected."""
+        with self._lock:
+            self._instances.setdefault(world_id, weakref.WeakSet()).add(world)
+
+    def get_instances(self, world_id: str) -> List[Any]:
+        """Get the live session copies of a world's template."""
+        with self._lock:
+            return list(self._instances.get(world_id, ()))
+
+    def clear(self) -> None:
+        """Drop all cached templates so the next request rebuilds them."""
+        with self._lock:
+            self._templates.clear()
+            self._build_locks.clear()
+            self._instances.clear()
+            self.build_times.clear()
+            self._worlds_data = None
+
+
+# Shared by every Game instance in the process
+world_templates = WorldTemplateCache()
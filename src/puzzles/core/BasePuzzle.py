@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+import copy
 from typing import Dict, List, Tuple, Optional, Any, Set, Callable
 from dataclasses import dataclass, field
 import logging
@@ -130,6 +131,21 @@ class BasePuzzle(ABC):
             'config': self.config
         }
 
+    def clone(self) -> 'BasePuzzle':
+        """
+        Create an independent copy of this puzzle for another game session.
+
+        Static configuration (aspects, steps, dialogue) is shared with the
+        original; only the progress-tracking state is copied.
+
+        Returns:
+            BasePuzzle: New puzzle instance
+        """
+        puzzle = copy.copy(self)
+        if hasattr(self, '_completed_groups'):
+            puzzle._completed_groups = set(self._completed_groups)
+        return puzzle
+
     @classmethod
     def deserialize(cls, data: Dict[str, Any]) -> 'BasePuzzle':
         """
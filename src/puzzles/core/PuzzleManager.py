@@ -1,30 +1,35 @@
 import logging
 from pathlib import Path
-from typing import Dict, Type
+from typing import Dict, Optional, Type
 from puzzles.core.BasePuzzle import BasePuzzle
 
 logger = logging.getLogger(__name__)
 
 class PuzzleManager:
     """Simplified manager that loads puzzles from types directory."""
+
+    # Puzzle classes discovered in the types directory, shared by all managers
+    _registered_types: Optional[Dict[str, Type[BasePuzzle]]] = None
     
     def __init__(self, world):
         self.world = world
         self.puzzles: Dict[str, BasePuzzle] = {}
-        self._puzzle_types: Dict[str, Type[BasePuzzle]] = {}
         
-        # Load puzzles from types directory
-        self._load_puzzle_types()
+        # Load puzzles from types directory (only scanned once per process)
+        if PuzzleManager._registered_types is None:
+            PuzzleManager._registered_types = self._load_puzzle_types()
+        self._puzzle_types: Dict[str, Type[BasePuzzle]] = PuzzleManager._registered_types
 
-    def _load_puzzle_types(self) -> None:
+    def _load_puzzle_types(self) -> Dict[str, Type[BasePuzzle]]:
         """Load puzzles from the types directory."""
+        self._puzzle_types = {}
         try:
             # Get path to types directory
             types_dir = Path(__file__).parent.parent / 'types'
             
             if not types_dir.exists():
                 logger.error(f"Puzzle types directory not found: {types_dir}")
-                return
+                return self._puzzle_types
 
             # Look for Python files directly in types directory
             for puzzle_file in types_dir.glob('*.py'):
@@ -56,6 +61,8 @@ class PuzzleManager:
         except Exception as e:
             logger.error(f"Error loading puzzle types: {str(e)}")
 
+        return self._puzzle_types
+
     def initialize_world_puzzles(self) -> None:
         """Initialize puzzles for the current world."""
         try: